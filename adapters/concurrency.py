@@ -0,0 +1,96 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease limit on concurrent downloads.
+
+    Download progress is fed in through progress_hook, which is a yt-dlp
+    progress hook. Once per interval, update() compares the aggregate
+    throughput with the previous sample. A gain above increase_threshold
+    allows one more worker; a drop above decrease_threshold multiplies the
+    limit by decrease_factor.
+    """
+
+    def __init__(
+        self,
+        initial: int = 2,
+        min_workers: int = 1,
+        max_workers: int = 16,
+        interval: float = 2.0,
+        increase_threshold: float = 0.05,
+        decrease_threshold: float = 0.10,
+        decrease_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.interval = interval
+        self.increase_threshold = increase_threshold
+        self.decrease_threshold = decrease_threshold
+        self.decrease_factor = decrease_factor
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._limit = max(min_workers, min(initial, max_workers))
+        self._bytes = 0
+        self._bytes_seen: Dict[str, int] = {}
+        self._sample_start = clock()
+        self._last_throughput: Optional[float] = None
+
+    @property
+    def limit(self) -> int:
+        """Number of downloads allowed to run at the same time."""
+        return self._limit
+
+    def progress_hook(self, status: dict) -> None:
+        """Accumulates the bytes downloaded since the previous report for the same file."""
+        downloaded = status.get("downloaded_bytes")
+        if downloaded is None:
+            return
+
+        key = status.get("filename") or status.get("tmpfilename") or ""
+        with self._lock:
+            previous = self._bytes_seen.get(key, 0)
+            self._bytes += max(0, downloaded - previous)
+            if status.get("status") == "finished":
+                self._bytes_seen.pop(key, None)
+            else:
+                self._bytes_seen[key] = downloaded
+
+    def update(self) -> int:
+        """Re-evaluates the limit if a full interval has elapsed, and returns it."""
+        now = self._clock()
+        with self._lock:
+            elapsed = now - self._sample_start
+            if elapsed < self.interval:
+                return self._limit
+
+            throughput = self._bytes / elapsed
+            previous = self._last_throughput
+            self._bytes = 0
+            self._sample_start = now
+            self._last_throughput = throughput
+
+            if previous is None or throughput > previous * (
+                1 + self.increase_threshold
+            ):
+                new_limit = min(self.max_workers, self._limit + 1)
+            elif throughput < previous * (1 - self.decrease_threshold):
+                new_limit = max(
+                    self.min_workers, int(self._limit * self.decrease_factor)
+                )
+            else:
+                new_limit = self._limit
+
+            if new_limit != self._limit:
+                logger.debug(
+                    f"Download concurrency {self._limit} -> {new_limit} "
+                    f"({throughput:.0f} B/s)."
+                )
+                self._limit = new_limit
+            return self._limit
@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -7,6 +8,21 @@ from mutagen.id3 import ID3, ID3NoHeaderError
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _read_comment(file_path: Path, mtime_ns: int, size: int) -> Optional[str]:
+    """
+    Parses the ID3 tag of an MP3 file and returns its first comment.
+    The modification time and size are part of the cache key, so a file
+    rewritten since the last read is parsed again.
+    """
+    audio = ID3(file_path)
+    comment_frames = audio.getall("COMM")
+    if comment_frames:
+        # Return the text of the first comment frame
+        return comment_frames[0].text[0]
+    return None
+
+
 class MutagenAdapter:
     """
     Adapter for reading and writing MP3 metadata using Mutagen.
@@ -22,16 +38,13 @@ class MutagenAdapter:
         Returns:
             The content of the comment tag, or None if not found or on error.
         """
-        if not file_path.exists():
+        try:
+            stat = file_path.stat()
+        except OSError:
             return None
 
         try:
-            audio = ID3(file_path)
-            comment_frames = audio.getall("COMM")
-            if comment_frames:
-                # Return the text of the first comment frame
-                return comment_frames[0].text[0]
-            return None
+            return _read_comment(file_path, stat.st_mtime_ns, stat.st_size)
         except ID3NoHeaderError:
             logger.warning(
                 f"File '{file_path}' does not have an ID3 header. Cannot read comment."
@@ -0,0 +1,84 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from cache_config import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Entries kept on disk; the least recently used ones are dropped first.
+MAX_ENTRIES = 10000
+
+
+class TitleCache:
+    """
+    Persistent video ID -> title map, so a tune seen in an earlier run can be
+    downloaded without fetching its metadata again.
+
+    Stored as JSON in <cache>/titles.json unless another path is given.
+    set() only updates memory; flush() writes the file once for a whole batch.
+    Lookups refresh recency in memory, which is saved with the next flush.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = MAX_ENTRIES):
+        self._path = path
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, str] = {}
+        self._loaded_from: Optional[Path] = None
+        self._dirty = False
+
+    def _load(self) -> Path:
+        """Reads the cache file once; a missing or corrupt file starts an empty cache."""
+        path = self._path or get_cache_dir("titles.json")
+        if path != self._loaded_from:
+            try:
+                entries = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                entries = {}
+            self._entries = entries if isinstance(entries, dict) else {}
+            self._loaded_from = path
+            self._dirty = False
+        return path
+
+    def get(self, video_id: str) -> Optional[str]:
+        with self._lock:
+            self._load()
+            title = self._entries.pop(video_id, None)
+            if title is not None:
+                self._entries[video_id] = title
+            return title
+
+    def set(self, video_id: str, title: str) -> None:
+        with self._lock:
+            self._load()
+            if self._entries.get(video_id) == title:
+                return
+
+            self._entries.pop(video_id, None)
+            self._entries[video_id] = title
+            while len(self._entries) > self._max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._dirty = True
+
+    def flush(self) -> None:
+        """Writes the entries to disk if titles were added since the last flush."""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            path = self._load()
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Write then rename so concurrent runs never read a partial file.
+                fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                    json.dump(self._entries, tmp_file, ensure_ascii=False)
+                os.replace(tmp_name, path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Could not save the title cache to '{path}': {e}")
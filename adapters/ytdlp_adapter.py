@@ -1,39 +1,134 @@
 import logging
-import yt_dlp
+import os
+import re
+import shutil
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional
 from pymonad.either import Left, Right, Either
 
+from adapters.concurrency import AIMDController
 from adapters.mutagen_adapter import MutagenAdapter
+from adapters.title_cache import TitleCache
 from domain.models import Playlist
 from domain.ports import MusicDownloader
 from domain.errors import DownloaderError
 
 logger = logging.getLogger(__name__)
 
+# Extra arguments passed to known external downloaders (multi-connection fetches).
+EXTERNAL_DOWNLOADER_ARGS = {"aria2c": ["-x", "16", "-k", "1M"]}
+
+# Upper bound on tunes downloaded at the same time by download_tunes_parallel.
+DEFAULT_MAX_WORKERS = 8
+
+# Video ID in watch?v=, youtu.be/ and shorts/ URLs; exactly 11 characters, so a
+# longer (invalid) ID is never truncated into another video's.
+VIDEO_ID_PATTERN = re.compile(
+    r"(?:[?&]v=|youtu\.be/|shorts/)([0-9A-Za-z_-]{11})(?![0-9A-Za-z_-])"
+)
+
+# Fragments fetched at once by a serial playlist download. Worker-pool downloads
+# keep yt-dlp's default: the tunes themselves already run concurrently.
+CONCURRENT_FRAGMENTS = 4
+
+# Options shared by every download; _get_ydl_opts adds the per-call ones.
+_BASE_YDL_OPTS = MappingProxyType(
+    {
+        "format": "bestaudio/best",
+        "ignoreerrors": True,
+        "verbose": False,
+    }
+)
+
+# Postprocessors run after audio extraction, which depends on the requested quality.
+# Shared by every call: yt-dlp copies each definition (dict(pp_def)) before use.
+_TAGGING_POSTPROCESSORS = (
+    MappingProxyType({"key": "EmbedThumbnail"}),
+    MappingProxyType({"key": "FFmpegMetadata", "add_metadata": True}),
+    MappingProxyType(
+        {
+            "key": "ModifyTags",
+            "tags": MappingProxyType({"comment": "%(webpage_url)s"}),
+        }
+    ),
+)
+
 
 class YTDLPAdapter(MusicDownloader):
-    def __init__(self, mutagen_adapter: MutagenAdapter = MutagenAdapter()):
-        self._mutagen_adapter = mutagen_adapter
+    def __init__(
+        self,
+        mutagen_adapter: Optional[MutagenAdapter] = None,
+        title_cache: Optional[TitleCache] = None,
+    ):
+        self._mutagen_adapter = mutagen_adapter or MutagenAdapter()
+        self._title_cache = title_cache or TitleCache()
+        self._external_downloader: Optional[str] = None
+        # Source URLs found in each scanned destination, keyed by destination.
+        self._dir_url_cache: Dict[str, Dict[str, Path]] = {}
 
-    def _is_tune_already_present(self, tune_url: str, destination: str) -> bool:
-        """Checks if a tune with the same URL is already in the destination."""
-        dest_path = Path(destination)
-        if not dest_path.is_dir():
+    def use_external_downloader(self, name: str) -> bool:
+        """
+        Delegates downloads to an external program (e.g. aria2c) if it is installed.
+        Falls back to yt-dlp's native downloader otherwise.
+        """
+        if shutil.which(name) is None:
+            logger.warning(
+                f"External downloader '{name}' not found, using the native downloader."
+            )
+            self._external_downloader = None
             return False
 
-        for file_path in dest_path.glob("*.mp3"):
-            existing_url = self._mutagen_adapter.get_comment(file_path)
-            if existing_url and existing_url.strip() == tune_url.strip():
-                return True
-        return False
+        logger.info(f"Using external downloader '{name}'.")
+        self._external_downloader = name
+        return True
+
+    def _is_tune_already_present(self, tune_url: str, destination: str) -> bool:
+        """
+        Checks if a tune with the same URL is already in the destination.
+        Each destination is scanned once; later lookups reuse the URLs read then.
+        """
+        known_urls = self._dir_url_cache.get(destination)
+        if known_urls is None:
+            try:
+                # One readdir; DirEntry.is_file() needs no extra stat() on most platforms
+                with os.scandir(destination) as entries:
+                    mp3_paths = [
+                        Path(entry.path)
+                        for entry in entries
+                        if entry.name.endswith(".mp3") and entry.is_file()
+                    ]
+            except OSError:
+                return False
+
+            known_urls = {}
+            for file_path in mp3_paths:
+                existing_url = self._mutagen_adapter.get_comment(file_path)
+                if existing_url:
+                    known_urls[existing_url.strip()] = file_path
+            self._dir_url_cache[destination] = known_urls
+
+        return tune_url.strip() in known_urls
 
     def _get_ydl_opts(
-        self, destination: str, quality: str, no_overwrites: bool, is_playlist: bool
+        self,
+        destination: str,
+        quality: str,
+        no_overwrites: bool,
+        is_playlist: bool,
+        progress_hook: Optional[Callable[[dict], None]] = None,
     ):
         """Creates the base options for yt-dlp."""
         audio_quality = "0" if quality == "best" else quality
-        return {
-            "format": "bestaudio/best",
+        ydl_opts = {
+            **_BASE_YDL_OPTS,
             "outtmpl": f"{destination}/%(title)s.%(ext)s",
             "postprocessors": [
                 {
@@ -41,57 +136,97 @@ class YTDLPAdapter(MusicDownloader):
                     "preferredcodec": "mp3",
                     "preferredquality": audio_quality,
                 },
-                {
-                    "key": "EmbedThumbnail",
-                },
-                {
-                    "key": "FFmpegMetadata",
-                    "add_metadata": True,
-                },
-                {"key": "ModifyTags", "tags": {"comment": "%(webpage_url)s"}},
+                *_TAGGING_POSTPROCESSORS,
             ],
-            "ignoreerrors": True,
-            "verbose": True, # Changed to True for debugging
             "no_overwrites": no_overwrites,
             "noplaylist": not is_playlist,
         }
+        if self._external_downloader:
+            name = self._external_downloader
+            ydl_opts["external_downloader"] = {"default": name}
+            ydl_opts["external_downloader_args"] = {
+                name: EXTERNAL_DOWNLOADER_ARGS.get(name, [])
+            }
+        if progress_hook:
+            ydl_opts["progress_hooks"] = [progress_hook]
+        return ydl_opts
 
     def download_tune(
-        self, tune_url: str, destination: str, quality: str = "192", green: bool = False
+        self,
+        tune_url: str,
+        destination: str,
+        quality: str = "192",
+        green: bool = False,
+        progress_hook: Optional[Callable[[dict], None]] = None,
     ) -> Either[DownloaderError, str]:
         """
         Downloads a single audio track from a YouTube URL.
         If green is True, it checks if a file with the same source URL exists before downloading.
+        progress_hook, if given, receives yt-dlp's download progress reports.
         """
+        try:
+            return self._download_tune(
+                tune_url, destination, quality, green, progress_hook
+            )
+        finally:
+            self._title_cache.flush()
+
+    def _download_tune(
+        self,
+        tune_url: str,
+        destination: str,
+        quality: str,
+        green: bool,
+        progress_hook: Optional[Callable[[dict], None]] = None,
+    ) -> Either[DownloaderError, str]:
+        """download_tune without saving the title cache, for batches that save it once."""
+        import yt_dlp
+
         logger.info(f"Attempting to download tune: {tune_url}")
 
         try:
-            # 1. Check if file exists if green mode is on
-            # Temporarily disabled for debugging
-            # if green and self._is_tune_already_present(tune_url, destination):
-            #     message = (
-            #         f"Track from URL '{tune_url}' already exists. Skipping download."
-            #     )
-            #     logger.info(message)
-            #     return Right(message)
-
-            # 2. Get video info for download
-            with yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True}) as ydl:
-                info = ydl.extract_info(tune_url, download=False)
-                title = info.get("title", "unknown_title")
-                video_id = info.get("id", "unknown_id")
+            # 1. Check if file exists if green mode is on.
+            # Done before extract_info so a tune already present costs no request.
+            if green and self._is_tune_already_present(tune_url, destination):
+                message = (
+                    f"Track from URL '{tune_url}' already exists. Skipping download."
+                )
+                logger.info(message)
+                return Right(message)
+
+            # 2. Get video info for download, from the title cache when the ID is known
+            match = VIDEO_ID_PATTERN.search(tune_url)
+            video_id = match.group(1) if match else None
+            title = self._title_cache.get(video_id) if video_id else None
+            if title is None:
+                with yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True}) as ydl:
+                    info = ydl.extract_info(tune_url, download=False)
+                    title = info.get("title", "unknown_title")
+                    video_id = info.get("id", "unknown_id")
+                if "title" in info and "id" in info:
+                    self._title_cache.set(video_id, title)
+            else:
+                logger.debug(f"Title of '{video_id}' found in cache: '{title}'.")
 
             # 3. Download the tune
             # We set no_overwrites to False here because our green check is now metadata-based.
             # The original check was filename-based, which is less reliable.
             ydl_opts = self._get_ydl_opts(
-                destination, quality, no_overwrites=False, is_playlist=False
+                destination,
+                quality,
+                no_overwrites=False,
+                is_playlist=False,
+                progress_hook=progress_hook,
             )
 
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                result_code = ydl.download(
-                    [f"https://www.youtube.com/watch?v={video_id}"]
-                )
+            try:
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    result_code = ydl.download(
+                        [f"https://www.youtube.com/watch?v={video_id}"]
+                    )
+            finally:
+                # Even a failed download may have written files: rescan on the next lookup
+                self._dir_url_cache.pop(destination, None)
 
             if result_code == 0:
                 success_message = (
@@ -111,23 +246,154 @@ class YTDLPAdapter(MusicDownloader):
             logger.critical(f"Critical error during download: {e}", exc_info=True)
             return Left(DownloaderError(error_message))
 
+    def download_tunes_parallel(
+        self,
+        tune_urls: List[str],
+        destination: str,
+        quality: str = "192",
+        green: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        controller: Optional[AIMDController] = None,
+        on_result: Optional[Callable[[str, Either[DownloaderError, str]], None]] = None,
+    ) -> List[Either[DownloaderError, str]]:
+        """
+        Downloads several tunes concurrently, so one tune's network transfer
+        overlaps another's ffmpeg post-processing.
+        With a controller, the number of downloads in flight follows its
+        adaptive limit instead of staying at max_workers.
+        on_result, if given, is called with each URL and its result as soon as
+        that download finishes.
+        Returns one Either per URL, in the order of tune_urls.
+        """
+        if not tune_urls:
+            return []
+        try:
+            if controller is not None:
+                return self._download_tunes_adaptive(
+                    tune_urls, destination, quality, green, controller, on_result
+                )
+
+            workers = max(1, min(max_workers, len(tune_urls)))
+            logger.info(f"Downloading {len(tune_urls)} tunes with {workers} workers.")
+            results: Dict[int, Either[DownloaderError, str]] = {}
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(
+                        self._download_tune, url, destination, quality, green
+                    ): index
+                    for index, url in enumerate(tune_urls)
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    results[index] = future.result()
+                    if on_result:
+                        on_result(tune_urls[index], results[index])
+            return [results[index] for index in range(len(tune_urls))]
+        finally:
+            # One write of the title cache for the whole batch
+            self._title_cache.flush()
+
+    def _download_tunes_adaptive(
+        self,
+        tune_urls: List[str],
+        destination: str,
+        quality: str,
+        green: bool,
+        controller: AIMDController,
+        on_result: Optional[Callable[[str, Either[DownloaderError, str]], None]],
+    ) -> List[Either[DownloaderError, str]]:
+        """
+        Keeps controller.limit downloads in flight, re-evaluating the limit
+        whenever a download finishes or the controller's interval elapses.
+        """
+        results: Dict[int, Either[DownloaderError, str]] = {}
+        pending = deque(enumerate(tune_urls))
+        running: Dict = {}
+
+        with ThreadPoolExecutor(max_workers=controller.max_workers) as executor:
+            while pending or running:
+                while pending and len(running) < controller.limit:
+                    index, url = pending.popleft()
+                    future = executor.submit(
+                        self._download_tune,
+                        url,
+                        destination,
+                        quality,
+                        green,
+                        progress_hook=controller.progress_hook,
+                    )
+                    running[future] = index
+
+                done, _ = wait(
+                    running, timeout=controller.interval, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    index = running.pop(future)
+                    results[index] = future.result()
+                    if on_result:
+                        on_result(tune_urls[index], results[index])
+                controller.update()
+
+        return [results[index] for index in range(len(tune_urls))]
+
+    def _download_playlist_entries(
+        self,
+        playlist: Playlist,
+        destination: str,
+        quality: str,
+        green: bool,
+        max_workers: int,
+    ) -> int:
+        """
+        Lists the playlist's entries and downloads them through the worker pool.
+        Returns a yt-dlp style exit code: 0 if every tune was downloaded, 1 otherwise.
+        """
+        import yt_dlp
+
+        with yt_dlp.YoutubeDL(
+            {"quiet": True, "no_warnings": True, "extract_flat": "in_playlist"}
+        ) as ydl:
+            info = ydl.extract_info(playlist.url, download=False)
+
+        entry_urls = [entry["url"] for entry in info.get("entries") or [] if entry]
+        results = self.download_tunes_parallel(
+            entry_urls, destination, quality, green, max_workers
+        )
+        return 0 if all(result.is_right() for result in results) else 1
+
     def download_playlist(
         self,
         playlist: Playlist,
         destination: str,
         quality: str = "192",
         green: bool = False,
+        max_workers: Optional[int] = None,
     ) -> Either[DownloaderError, str]:
         """
         Downloads all audio tracks from a YouTube playlist to a specified local directory.
+        With max_workers > 1, the tracks are downloaded concurrently, one tune per worker.
         """
+        import yt_dlp
+
         logger.info(f"Starting download of playlist '{playlist.title}'...")
 
-        ydl_opts = self._get_ydl_opts(destination, quality, no_overwrites=False, is_playlist=True)
+        ydl_opts = self._get_ydl_opts(
+            destination, quality, no_overwrites=green, is_playlist=True
+        )
+        ydl_opts["concurrent_fragment_downloads"] = CONCURRENT_FRAGMENTS
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                result_code = ydl.download([playlist.url])
+            try:
+                if max_workers and max_workers > 1:
+                    result_code = self._download_playlist_entries(
+                        playlist, destination, quality, green, max_workers
+                    )
+                else:
+                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                        result_code = ydl.download([playlist.url])
+            finally:
+                # With ignoreerrors, a partly failed playlist still wrote files
+                self._dir_url_cache.pop(destination, None)
 
             if result_code == 0:
                 success_message = f"Playlist '{playlist.title}' downloaded successfully to '{destination}'."
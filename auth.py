@@ -1,4 +1,4 @@
-import os
+import json
 import logging
 from pymonad.either import Left, Right
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -11,16 +11,25 @@ logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/youtube.force-ssl"]
 
+# Credentials obtained in this process, keyed by (token_file, client_secrets_file).
+_creds_cache: dict = {}
+
 
 def get_credentials(
     token_file: str = "token.json", client_secrets_file: str = "client_secret.json"
 ):
-    creds = None
+    cache_key = (token_file, client_secrets_file)
+    creds = _creds_cache.get(cache_key)
 
-    if os.path.exists(token_file):
-        logger.info(f"Token file '{token_file}' found.")
+    if creds is not None:
+        logger.info("Using credentials cached for this session.")
+    else:
         try:
-            creds = Credentials.from_authorized_user_file(token_file, SCOPES)
+            with open(token_file, "r") as token:
+                logger.info(f"Token file '{token_file}' found.")
+                creds = Credentials.from_authorized_user_info(json.load(token), SCOPES)
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.error(f"Error reading token file: {e}")
             return Left(AuthenticationError(f"Corrupt or invalid token file: {e}"))
@@ -33,11 +42,18 @@ def get_credentials(
                 logger.info("Token refreshed successfully.")
             except Exception as e:
                 logger.error(f"Token refresh failed: {e}. Starting full flow.")
+                _creds_cache.pop(cache_key, None)
                 creds = None
 
         if not creds:
             logger.info("No valid token found, starting new authentication flow.")
-            if not os.path.exists(client_secrets_file):
+            try:
+                with open(client_secrets_file, "r") as secrets:
+                    client_config = json.load(secrets)
+                flow = InstalledAppFlow.from_client_config(client_config, SCOPES)
+                creds = flow.run_local_server(port=0)
+                logger.info("Authentication successful via local flow.")
+            except FileNotFoundError:
                 logger.error(f"Secrets file '{client_secrets_file}' not found.")
                 return Left(
                     AuthenticationError(
@@ -45,13 +61,6 @@ def get_credentials(
                         "Please download it from the Google Cloud Console."
                     )
                 )
-
-            try:
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    client_secrets_file, SCOPES
-                )
-                creds = flow.run_local_server(port=0)
-                logger.info("Authentication successful via local flow.")
             except Exception as e:
                 logger.error(f"Authentication flow failed: {e}")
                 return Left(AuthenticationError(f"Authentication flow failed: {e}"))
@@ -64,5 +73,6 @@ def get_credentials(
             logger.error(f"Could not save token: {e}")
             return Left(AuthenticationError(f"Could not save token: {e}"))
 
+    _creds_cache[cache_key] = creds
     logger.info("Valid credentials obtained.")
     return Right(creds)
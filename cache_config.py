@@ -0,0 +1,14 @@
+import os
+from pathlib import Path
+
+APP_NAME = "playlist-downloader"
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """
+    Retourne le dossier de cache de l'application (sans le créer).
+
+    Respecte XDG_CACHE_HOME, avec ~/.cache comme valeur par défaut.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base, APP_NAME, *parts)
@@ -1,26 +1,24 @@
 import typer
+import functools
 import logging
 from rich.console import Console
 import re
-import yaml
 from pathlib import Path
-import yt_dlp
-from typing import Optional, Any, Callable
+from typing import Optional, Any
 from toolz import pipe
 
 # App-specific imports
-from auth import get_credentials
-from youtube_api import (
-    create_playlist as api_create_playlist,
-    delete_playlist as api_delete_playlist,
-    get_playlist_url as api_get_playlist_url,
-)
 from domain.models import Playlist
-from adapters.ytdlp_adapter import YTDLPAdapter
+from adapters.concurrency import AIMDController
+from adapters.ytdlp_adapter import DEFAULT_MAX_WORKERS, YTDLPAdapter
 from domain.errors import AppError, DownloaderError
-from pymonad.either import Either, Left, Right
+from pymonad.either import Either, Left
 from i18n import get_message, set_lang, get_default_lang
 
+# Explicit ASCII classes: playlist IDs and sanitized titles never need Unicode \w.
+PLAYLIST_ID_PATTERN = re.compile(r"list=([A-Za-z0-9_-]+)")
+NON_ALNUM_PATTERN = re.compile(r"[^A-Za-z0-9_]")
+
 # Initialization
 console = Console()
 logger = logging.getLogger(__name__)
@@ -47,12 +45,20 @@ def main_callback(
         help="Set the language for output messages (e.g., 'en' or 'fr').",
         show_default=False,
     ),
+    external_downloader: Optional[str] = typer.Option(
+        None,
+        "--external-downloader",
+        help=get_message("help_external_downloader"),
+        show_default=False,
+    ),
 ):
     """Manage YouTube playlists from the command line."""
     if lang:
         set_lang(lang)
         state["lang"] = lang
         logger.info(f"Language explicitly set to: {lang}")
+    if external_downloader:
+        downloader.use_external_downloader(external_downloader)
 
 
 # --- Helper Functions ---
@@ -64,8 +70,59 @@ def _handle_error(error: AppError) -> None:
     raise typer.Exit(code=1)
 
 
+@functools.lru_cache(maxsize=128)
+def _parse_yaml_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """Parses a YAML file. The result is shared between calls: treat it as read-only."""
+    import yaml
+
+    # LibYAML's C loader is much faster; fall back to the pure-Python one if absent.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(Path(path).read_bytes(), Loader=loader)
+
+
+def _load_yaml(file_path: Path) -> Any:
+    """Loads a YAML file, re-parsing it only when its mtime or size changes."""
+    stat = file_path.stat()
+    return _parse_yaml_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+def _print_download_result(result: Either[DownloaderError, str], url: str) -> None:
+    """Prints the outcome of a single tune or playlist download."""
+    if result.is_right():
+        msg = result.value
+        console.print(f"  [bold green]✓[/bold green] {Path(url).name}: {msg}")
+    else:
+        err_obj = result.value
+        console.print(f"  [bold red]✗[/bold red] {Path(url).name}: {err_obj.message}")
+
+
+def _import_from_config(
+    config: dict, output_dir: Path, quality: int, flat: bool, green: bool
+) -> None:
+    """Downloads the tunes and playlists of each artist listed in an import config."""
+    for artist in config.get("artists", []):
+        artist_name = artist.get("name")
+        console.print(f"Processing artist: {artist_name}")
+        final_output_dir = output_dir if flat else output_dir / artist_name
+        final_output_dir.mkdir(parents=True, exist_ok=True)
+
+        for tune_url in artist.get("tunes", []):
+            download_result = downloader.download_tune(
+                tune_url, str(final_output_dir), str(quality), green
+            )
+            _print_download_result(download_result, tune_url)
+        for playlist_url in artist.get("playlists", []):
+            playlist = Playlist(playlist_id="N/A", title="N/A", url=playlist_url)
+            download_result = downloader.download_playlist(
+                playlist, str(final_output_dir), str(quality), green
+            )
+            _print_download_result(download_result, playlist_url)
+
+
 def _handle_auth_flow() -> Either[AppError, Any]:
     """Handles the authentication flow and displays messages."""
+    from auth import get_credentials
+
     console.print(f"🔐 {get_message('auth_attempt')}")
 
     def on_success(creds: Any) -> Any:
@@ -92,6 +149,8 @@ def create_playlist(
     ),
 ):
     """Creates a new YouTube playlist."""
+    from youtube_api import create_playlist as api_create_playlist
+
     logger.info("Command 'create' initiated.")
 
     def create_flow(creds: Any) -> Either[AppError, str]:
@@ -126,7 +185,7 @@ def download_playlist(
     logger.info(f"Command 'download' initiated for URL: {url}")
     console.print(f"📥 {get_message('preparing_download')}...")
 
-    playlist_id_match = re.search(r"list=([\w-]+)", url)
+    playlist_id_match = PLAYLIST_ID_PATTERN.search(url)
     if not playlist_id_match:
         _handle_error(AppError("Invalid playlist URL."))
         return
@@ -158,8 +217,23 @@ def update_playlist(
     delete: bool = typer.Option(
         False, "--delete", help="Delete local files no longer in the playlist."
     ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        "-w",
+        min=1,
+        max=DEFAULT_MAX_WORKERS,
+        help="Number of tracks downloaded at the same time (1=one after another).",
+    ),
+    adaptive: bool = typer.Option(
+        False,
+        "--adaptive",
+        help="Adjust the number of concurrent downloads to the measured throughput, up to --workers.",
+    ),
 ):
     """Synchronizes a local folder with a YouTube playlist."""
+    import yt_dlp
+
     logger.info(f"Command 'update' initiated for URL: {url}")
     console.print(f"🔄 {get_message('preparing_sync')}...")
 
@@ -169,7 +243,7 @@ def update_playlist(
         ) as ydl:
             info = ydl.extract_info(url, download=False)
             remote_videos = {
-                re.sub(r"[^A-Za-z0-9_]", "", entry["title"]): entry["url"]
+                NON_ALNUM_PATTERN.sub("", entry["title"]): entry["url"]
                 for entry in info["entries"]
             }
     except Exception as e:
@@ -182,7 +256,7 @@ def update_playlist(
 
     local_files = {f.stem: f for f in local_dir.glob("*.mp3")}
     sanitized_local_files = {
-        re.sub(r"[^A-Za-z0-9_]", "", k): v for k, v in local_files.items()
+        NON_ALNUM_PATTERN.sub("", k): v for k, v in local_files.items()
     }
     console.print(f"📁 {get_message('local_folder_info', count=len(local_files))}")
 
@@ -195,10 +269,9 @@ def update_playlist(
 
     if videos_to_download:
         console.print(f"\n[bold]🚀 {get_message('starting_download')}...[/bold]")
-        for stem, video_url in videos_to_download.items():
-            downloader.download_tune(
-                video_url, str(local_dir), str(quality), green=True
-            ).map(
+
+        def print_result(video_url: str, result: Either[DownloaderError, str]):
+            result.map(
                 lambda msg: console.print(f"  - [bold green]✓[/bold green] {msg}")
             ).catch(
                 lambda err: console.print(
@@ -206,6 +279,25 @@ def update_playlist(
                 )
             )
 
+        if workers == 1 and not adaptive:
+            for video_url in videos_to_download.values():
+                print_result(
+                    video_url,
+                    downloader.download_tune(
+                        video_url, str(local_dir), str(quality), green=True
+                    ),
+                )
+        else:
+            downloader.download_tunes_parallel(
+                list(videos_to_download.values()),
+                str(local_dir),
+                str(quality),
+                green=True,
+                max_workers=workers,
+                controller=AIMDController(max_workers=workers) if adaptive else None,
+                on_result=print_result,
+            )
+
     if delete:
         files_to_delete = {
             k: v for k, v in sanitized_local_files.items() if k not in remote_videos
@@ -234,6 +326,8 @@ def delete_playlist(
     name: str = typer.Argument(..., help=get_message("help_delete_name")),
 ):
     """Deletes a YouTube playlist."""
+    from youtube_api import delete_playlist as api_delete_playlist
+
     logger.info(f"Command 'delete' initiated for playlist: {name}")
 
     def delete_flow(creds: Any) -> Either[AppError, None]:
@@ -258,6 +352,8 @@ def share_playlist(
     name: str = typer.Argument(..., help=get_message("help_share_name")),
 ):
     """Gets the shareable URL of a YouTube playlist."""
+    from youtube_api import get_playlist_url as api_get_playlist_url
+
     logger.info(f"Command 'share' initiated for playlist: {name}")
 
     def share_flow(creds: Any) -> Either[AppError, str]:
@@ -333,41 +429,12 @@ def import_tunes(
     )
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    def handle_download_result(result: Either[DownloaderError, str], url: str):
-        if result.is_right():
-            msg = result.value
-            console.print(f"  [bold green]✓[/bold green] {Path(url).name}: {msg}")
-        else:
-            err_obj = result.value
-            console.print(
-                f"  [bold red]✗[/bold red] {Path(url).name}: {err_obj.message}"
-            )
-
     if file_path:
+        import yaml
+
         logger.info(f"Starting import from file: {file_path}, Flat structure: {flat}")
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                data = yaml.safe_load(file)
-            artists = data.get("artists", [])
-            for artist in artists:
-                artist_name = artist.get("name")
-                console.print(f"Processing artist: {artist_name}")
-                final_output_dir = output_dir if flat else output_dir / artist_name
-                final_output_dir.mkdir(parents=True, exist_ok=True)
-
-                for tune_url in artist.get("tunes", []):
-                    download_result = downloader.download_tune(
-                        tune_url, str(final_output_dir), str(quality), green
-                    )
-                    handle_download_result(download_result, tune_url)
-                for playlist_url in artist.get("playlists", []):
-                    playlist = Playlist(
-                        playlist_id="N/A", title="N/A", url=playlist_url
-                    )
-                    download_result = downloader.download_playlist(
-                        playlist, str(final_output_dir), str(quality), green
-                    )
-                    handle_download_result(download_result, playlist_url)
+            _import_from_config(_load_yaml(file_path), output_dir, quality, flat, green)
         except (yaml.YAMLError, IOError) as e:
             _handle_error(
                 AppError(get_message("import_error", yaml_file=str(file_path), error=str(e)))
@@ -379,13 +446,13 @@ def import_tunes(
             download_result = downloader.download_tune(
                 tune_url, str(output_dir), str(quality), green
             )
-            handle_download_result(download_result, tune_url)
+            _print_download_result(download_result, tune_url)
         for playlist_url in playlists or []:
             playlist = Playlist(playlist_id="N/A", title="N/A", url=playlist_url)
             download_result = downloader.download_playlist(
                 playlist, str(output_dir), str(quality), green
             )
-            handle_download_result(download_result, playlist_url)
+            _print_download_result(download_result, playlist_url)
 
     console.print(
         f"\n[bold green]✨ {get_message('import_completed', yaml_file=str(file_path) if file_path else 'CLI options')}![/bold green]"
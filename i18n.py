@@ -31,6 +31,7 @@ MESSAGES = {
         "help_import_flat": "Do not create subdirectories per artist.",
         "help_green": "Enable green mode (skip existing files).",
         "help_lang": "Set the language for output messages (e.g., 'en' or 'fr').",
+        "help_external_downloader": "External program used for downloads when installed (e.g., 'aria2c').",
         "import_source_missing": "You must provide a YAML file or at least one URL via --tune or --playlist.",
         "auth_attempt": "Attempting to authenticate with Google...",
         "creating_playlist": "Creating playlist '{name}'...",
@@ -77,6 +78,7 @@ MESSAGES = {
         "help_import_flat": "Ne pas créer de sous-dossiers par artiste.",
         "help_green": "Activer le mode écologique (ignore les fichiers existants).",
         "help_lang": "Définit la langue des messages de sortie (ex: 'en' ou 'fr').",
+        "help_external_downloader": "Programme externe utilisé pour les téléchargements s'il est installé (ex: 'aria2c').",
         "import_source_missing": "Vous devez fournir un fichier YAML ou au moins une URL via --tune ou --playlist.",
         "auth_attempt": "Tentative d'authentification auprès de Google...",
         "creating_playlist": "Création de la playlist '{name}' en cours...",
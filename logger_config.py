@@ -7,6 +7,10 @@ def setup_logger():
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
 
+    # Déjà configuré : ne pas recréer de handler à chaque appel
+    if logger.handlers:
+        return
+
     # Créer un handler pour la sortie console
     handler = logging.StreamHandler(sys.stdout)
 
@@ -16,9 +20,8 @@ def setup_logger():
     )
     handler.setFormatter(formatter)
 
-    # Ajouter le handler au logger (s'il n'en a pas déjà un)
-    if not logger.handlers:
-        logger.addHandler(handler)
+    # Ajouter le handler au logger
+    logger.addHandler(handler)
 
 
 # Appeler la configuration au moment de l'import
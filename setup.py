@@ -6,7 +6,8 @@ setup(
     packages=find_packages(exclude=["tests", "tests.*"]),
     include_package_data=True,
     install_requires=[
-        "typer[all]",
+        "typer>=0.9",
+        "rich",
         "pymonad>=2.4.0",
         "yt-dlp",
         "google-api-python-client",
@@ -17,6 +18,7 @@ setup(
         "dev": [
             "pytest",
             "pytest-mock",
+            "pytest-xdist",
             "ruff",
             "setuptools",
             "wheel",
@@ -0,0 +1,13 @@
+"""Assertion helpers shared by the tests."""
+
+
+def assert_left(result, error_type, fragment):
+    """
+    Asserts that ``result`` is a Left holding an ``error_type`` whose message
+    contains ``fragment``, and returns that error.
+    """
+    assert result.is_left()
+    error_value, _ = result.monoid
+    assert isinstance(error_value, error_type)
+    assert fragment in error_value.message
+    return error_value
@@ -0,0 +1,24 @@
+"""Canned yt_dlp responses shared by the importer tests."""
+
+# Responses are built once per URL; later calls for the same URL reuse them.
+_RESPONSES: dict = {}
+
+
+def _build_response(url):
+    if "playlist" in url:
+        return {
+            "title": url.replace("https://", ""),
+            "entries": [
+                {"id": f"v_{url}_1", "title": f"Song 1 from {url}"},
+                {"id": f"v_{url}_2", "title": f"Song 2 from {url}"},
+            ],
+        }
+    return {"id": url.replace("https://", ""), "title": f"Tune from {url}"}
+
+
+def extract_info_side_effect(url, download=True):
+    """Mimics YoutubeDL.extract_info: URLs containing 'playlist' yield two entries."""
+    response = _RESPONSES.get(url)
+    if response is None:
+        response = _RESPONSES[url] = _build_response(url)
+    return response
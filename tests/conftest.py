@@ -0,0 +1,123 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _configure_logging():
+    """Sets up the root logger once for the whole test session."""
+    from logger_config import setup_logger
+
+    setup_logger()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _isolated_cache_dir(tmp_path_factory):
+    """Keeps the on-disk title cache out of the user's home."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
+        yield
+
+
+class FakeYDL:
+    """
+    Stand-in for yt_dlp.YoutubeDL. Tests set the next_* class attributes to
+    script the outcome and read back the last options, the URLs whose info
+    was extracted and the downloaded URLs.
+    """
+
+    opts = None
+    extracted: list = []
+    downloads: list = []
+    next_info: dict = {}
+    next_rc = 0
+    next_exc = None
+
+    @classmethod
+    def reset(cls):
+        cls.opts = None
+        cls.extracted = []
+        cls.downloads = []
+        cls.next_info = {}
+        cls.next_rc = 0
+        cls.next_exc = None
+
+    def __init__(self, opts=None):
+        type(self).opts = opts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def extract_info(self, url, download=True):
+        type(self).extracted.append(url)
+        return type(self).next_info
+
+    def download(self, urls):
+        type(self).downloads.append(urls)
+        if type(self).next_exc is not None:
+            raise type(self).next_exc
+        return type(self).next_rc
+
+
+@pytest.fixture
+def fake_ytdl(monkeypatch):
+    """Replaces yt_dlp.YoutubeDL with a freshly reset FakeYDL."""
+    FakeYDL.reset()
+    monkeypatch.setattr("yt_dlp.YoutubeDL", FakeYDL)
+    return FakeYDL
+
+
+@pytest.fixture
+def fake_youtube():
+    """
+    Returns a factory for a minimal YouTube service stub. Each playlists()
+    call is recorded as (method, kwargs) in the service's ``calls`` list;
+    execute() returns ``result`` or raises ``error``. Batches report each
+    request to their callback the same way and are counted in ``batches``.
+    """
+
+    def factory(result=None, error=None):
+        calls = []
+
+        def execute():
+            if error is not None:
+                raise error
+            return result
+
+        request = SimpleNamespace(execute=execute)
+
+        def recorder(method):
+            def call(**kwargs):
+                calls.append((method, kwargs))
+                return request
+
+            return call
+
+        playlists = SimpleNamespace(
+            insert=recorder("insert"), delete=recorder("delete"), list=recorder("list")
+        )
+        service = SimpleNamespace(playlists=lambda: playlists, calls=calls, batches=0)
+
+        def new_batch_http_request(callback):
+            added = []
+
+            def execute_batch():
+                service.batches += 1
+                for request_id in added:
+                    try:
+                        callback(request_id, request.execute(), None)
+                    except Exception as e:
+                        callback(request_id, None, e)
+
+            return SimpleNamespace(
+                add=lambda request, request_id: added.append(request_id),
+                execute=execute_batch,
+            )
+
+        service.new_batch_http_request = new_batch_http_request
+        return service
+
+    return factory
@@ -1,90 +1,97 @@
+import pytest
 from unittest.mock import MagicMock
-from auth import get_credentials
+from auth import SCOPES, _creds_cache, get_credentials
 from domain.errors import AuthenticationError
+from tests._assertions import assert_left
+
+
+@pytest.fixture(autouse=True)
+def _in_tmp_dir(tmp_path, monkeypatch):
+    """Runs each scenario from an empty directory (no token, no secrets)."""
+    monkeypatch.chdir(tmp_path)
+    _creds_cache.clear()
+    yield
+    _creds_cache.clear()
 
 
 # Scenario 1: client_secret.json file is missing
-def test_get_credentials_no_secret_file(mocker, caplog):
+def test_get_credentials_no_secret_file(caplog):
     """
     Checks that the function returns an error if client_secret.json is not found.
     LDD: Verifies that the error log is emitted correctly.
     """
-    # The first call (token) returns False, the second (secret) also returns False.
-    mocker.patch("os.path.exists", side_effect=[False, False])
-
     result = get_credentials(client_secrets_file="fake_secrets.json")
 
-    assert result.is_left()
-    # We extract the value from the monad for the check
-    error_value, _ = result.monoid
-    assert isinstance(error_value, AuthenticationError)
-    assert "not found" in error_value.message
+    assert_left(result, AuthenticationError, "not found")
     # Log verification
-    assert "Secrets file 'fake_secrets.json' not found." in caplog.text
+    assert any(
+        "Secrets file 'fake_secrets.json' not found." in r.getMessage()
+        for r in caplog.records
+    )
 
 
 # Scenario 2: Full authentication successful (no existing token)
-def test_get_credentials_full_flow_success(mocker, caplog):
+def test_get_credentials_full_flow_success(tmp_path, monkeypatch, caplog):
     """
     Simulates the complete authentication flow and verifies success.
     LDD: Verifies the info logs for the flow and saving process.
     """
-    # Mock external dependencies
-    mocker.patch(
-        "os.path.exists", side_effect=[False, True]
-    )  # token does not exist, secret exists
+    # Token does not exist, secret exists
+    (tmp_path / "client_secret.json").write_text("{}")
     mock_creds = MagicMock()
     mock_creds.to_json.return_value = '{"token": "mock"}'
 
     mock_flow = MagicMock()
     mock_flow.run_local_server.return_value = mock_creds
-    mocker.patch(
-        "google_auth_oauthlib.flow.InstalledAppFlow.from_client_secrets_file",
-        return_value=mock_flow,
+    monkeypatch.setattr(
+        "google_auth_oauthlib.flow.InstalledAppFlow.from_client_config",
+        MagicMock(return_value=mock_flow),
     )
 
-    # Mock file writing
-    mocker.patch("builtins.open", mocker.mock_open())
-
     result = get_credentials()
 
     assert result.is_right()
     assert result.value == mock_creds
+    assert (tmp_path / "token.json").read_text() == '{"token": "mock"}'
     # Log verification
-    assert "No valid token found" in caplog.text
-    assert "Authentication successful via local flow" in caplog.text
-    assert "Token saved to 'token.json'" in caplog.text
+    messages = [r.getMessage() for r in caplog.records]
+    assert any("No valid token found" in m for m in messages)
+    assert any("Authentication successful via local flow" in m for m in messages)
+    assert any("Token saved to 'token.json'" in m for m in messages)
 
 
 # Scenario 3: Existing and valid token
-def test_get_credentials_valid_token_exists(mocker, caplog):
+def test_get_credentials_valid_token_exists(tmp_path, monkeypatch, caplog):
     """
     Checks that credentials are loaded from an existing and valid token.
     LDD: Verifies the success log.
     """
-    mocker.patch("os.path.exists", return_value=True)
+    (tmp_path / "token.json").write_text('{"token": "valid"}')
     mock_creds = MagicMock()
     mock_creds.valid = True
-    mocker.patch(
-        "google.oauth2.credentials.Credentials.from_authorized_user_file",
-        return_value=mock_creds,
+    mock_from_info = MagicMock(return_value=mock_creds)
+    monkeypatch.setattr(
+        "google.oauth2.credentials.Credentials.from_authorized_user_info",
+        mock_from_info,
     )
 
     result = get_credentials()
 
     assert result.is_right()
     assert result.value == mock_creds
-    assert "Valid credentials obtained" in caplog.text
-    assert "Token file 'token.json' found" in caplog.text
+    mock_from_info.assert_called_once_with({"token": "valid"}, SCOPES)
+    messages = [r.getMessage() for r in caplog.records]
+    assert any("Valid credentials obtained" in m for m in messages)
+    assert any("Token file 'token.json' found" in m for m in messages)
 
 
 # Scenario 4: Expired token but successful refresh
-def test_get_credentials_expired_token_refresh_success(mocker, caplog):
+def test_get_credentials_expired_token_refresh_success(tmp_path, monkeypatch, caplog):
     """
     Checks that the token is refreshed successfully.
     LDD: Verifies the refresh logs.
     """
-    mocker.patch("os.path.exists", return_value=True)
+    (tmp_path / "token.json").write_text('{"token": "expired"}')
     mock_creds = MagicMock()
     mock_creds.valid = False
     mock_creds.expired = True
@@ -92,16 +99,45 @@ def test_get_credentials_expired_token_refresh_success(mocker, caplog):
 
     # The refresh method returns nothing, it modifies the object in place
     mock_creds.refresh.return_value = None
-    mocker.patch(
-        "google.oauth2.credentials.Credentials.from_authorized_user_file",
-        return_value=mock_creds,
+    mock_creds.to_json.return_value = '{"token": "refreshed"}'
+    monkeypatch.setattr(
+        "google.oauth2.credentials.Credentials.from_authorized_user_info",
+        MagicMock(return_value=mock_creds),
     )
-    mocker.patch("builtins.open", mocker.mock_open())
 
     result = get_credentials()
 
     assert result.is_right()
     mock_creds.refresh.assert_called_once()
-    assert "Token expired, attempting refresh..." in caplog.text
-    assert "Token refreshed successfully." in caplog.text
-    assert "Token saved" in caplog.text
+    messages = [r.getMessage() for r in caplog.records]
+    assert any("Token expired, attempting refresh..." in m for m in messages)
+    assert any("Token refreshed successfully." in m for m in messages)
+    assert any("Token saved" in m for m in messages)
+
+
+# Scenario 5: Credentials are reused within the same process
+def test_get_credentials_uses_session_cache(tmp_path, monkeypatch, caplog):
+    """
+    Checks that a second call reuses the credentials obtained by the first
+    one instead of reading token.json again.
+    LDD: Verifies the cache log.
+    """
+    (tmp_path / "token.json").write_text('{"token": "valid"}')
+    mock_creds = MagicMock()
+    mock_creds.valid = True
+    mock_from_info = MagicMock(return_value=mock_creds)
+    monkeypatch.setattr(
+        "google.oauth2.credentials.Credentials.from_authorized_user_info",
+        mock_from_info,
+    )
+
+    first = get_credentials()
+    (tmp_path / "token.json").unlink()
+    second = get_credentials()
+
+    assert first.value is second.value
+    mock_from_info.assert_called_once()
+    assert any(
+        "Using credentials cached for this session." in r.getMessage()
+        for r in caplog.records
+    )
@@ -0,0 +1,116 @@
+import pytest
+
+from adapters.concurrency import AIMDController
+
+
+class FakeClock:
+    """Manually advanced replacement for time.monotonic."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _transfer(controller, clock, nbytes, filename="tune.webm"):
+    """Reports nbytes more for filename, then closes the sampling interval."""
+    seen = controller._bytes_seen.get(filename, 0)
+    controller.progress_hook(
+        {
+            "status": "downloading",
+            "filename": filename,
+            "downloaded_bytes": seen + nbytes,
+        }
+    )
+    clock.now += controller.interval
+    return controller.update()
+
+
+def test_limit_holds_until_interval_elapses(clock):
+    """
+    Given a controller whose interval has not elapsed,
+    When update is called,
+    Then the limit should stay unchanged.
+    """
+    controller = AIMDController(initial=2, clock=clock)
+    controller.progress_hook({"status": "downloading", "downloaded_bytes": 1000})
+
+    assert controller.update() == 2
+
+
+def test_limit_increases_while_throughput_grows(clock):
+    """
+    Given throughput growing by more than the increase threshold,
+    When each interval closes,
+    Then the limit should grow by one worker.
+    """
+    controller = AIMDController(initial=2, clock=clock)
+
+    assert _transfer(controller, clock, 1000) == 3
+    assert _transfer(controller, clock, 2000) == 4
+
+
+def test_limit_is_halved_when_throughput_drops(clock):
+    """
+    Given throughput dropping by more than the decrease threshold,
+    When the interval closes,
+    Then the limit should be multiplied by the decrease factor.
+    """
+    controller = AIMDController(initial=7, clock=clock)
+    _transfer(controller, clock, 4000)
+
+    assert _transfer(controller, clock, 1000) == 4
+
+
+def test_limit_holds_when_throughput_is_flat(clock):
+    """
+    Given throughput within both thresholds of the previous sample,
+    When the interval closes,
+    Then the limit should stay unchanged.
+    """
+    controller = AIMDController(initial=2, clock=clock)
+    _transfer(controller, clock, 1000)
+
+    assert _transfer(controller, clock, 1020) == 3
+
+
+def test_limit_stays_within_bounds(clock):
+    """
+    Given a controller at its bounds,
+    When throughput keeps growing or collapses,
+    Then the limit should never leave [min_workers, max_workers].
+    """
+    controller = AIMDController(initial=2, min_workers=1, max_workers=3, clock=clock)
+    for nbytes in (1000, 2000, 4000):
+        _transfer(controller, clock, nbytes)
+    assert controller.limit == 3
+
+    _transfer(controller, clock, 1)
+    _transfer(controller, clock, 0)
+    assert controller.limit == 1
+
+
+def test_progress_hook_counts_each_byte_once(clock):
+    """
+    Given cumulative progress reports for a file,
+    When the file finishes,
+    Then only the new bytes of each report should be counted.
+    """
+    controller = AIMDController(clock=clock)
+    for downloaded, status in (
+        (100, "downloading"),
+        (300, "downloading"),
+        (300, "finished"),
+    ):
+        controller.progress_hook(
+            {"status": status, "filename": "a.webm", "downloaded_bytes": downloaded}
+        )
+
+    assert controller._bytes == 300
+    assert "a.webm" not in controller._bytes_seen
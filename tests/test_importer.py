@@ -3,42 +3,53 @@ from typer.testing import CliRunner
 from unittest.mock import patch, MagicMock
 
 # Make sure to use the anglicized and internationalized CLI app
-from cli import app
+from cli import app, _import_from_config, _load_yaml, _parse_yaml_cached
 from i18n import set_lang
+from tests._importer_mocks import extract_info_side_effect
 
 runner = CliRunner()
 
+# Common argv prefixes; tests only append the varying tail.
+IMPORT_ARGS = ("--lang", "en", "import")
+TUNE1_ARGS = ("--tune", "https://tune1")
 
-@pytest.fixture(autouse=True)
+
+@pytest.fixture(scope="session", autouse=True)
 def set_english_lang():
-    """Fixture to ensure all tests run with English messages."""
+    """
+    Fixture to ensure all tests run with English messages. Set once: every
+    CLI invocation below also passes --lang en, so no test switches language.
+    """
     set_lang("en")
 
 
-@pytest.fixture
-def mock_youtube_dl():
-    """Fixture to mock yt_dlp.YoutubeDL."""
-    with patch("adapters.ytdlp_adapter.yt_dlp.YoutubeDL") as mock:
+@pytest.fixture(scope="module")
+def _youtube_dl_instance():
+    """Patches yt_dlp.YoutubeDL once for the whole module."""
+    with patch("yt_dlp.YoutubeDL") as mock:
         mock_instance = MagicMock()
         mock.return_value.__enter__.return_value = mock_instance
-
-        def extract_info_side_effect(url, download=True):
-            if "playlist" in url:
-                return {
-                    "title": url.replace("https://", ""),
-                    "entries": [
-                        {"id": f"v_{url}_1", "title": f"Song 1 from {url}"},
-                        {"id": f"v_{url}_2", "title": f"Song 2 from {url}"},
-                    ],
-                }
-            else:
-                return {"id": url.replace("https://", ""), "title": f"Tune from {url}"}
-
         mock_instance.extract_info.side_effect = extract_info_side_effect
         mock_instance.download.return_value = 0
         yield mock_instance
 
 
+@pytest.fixture
+def mock_youtube_dl(_youtube_dl_instance):
+    """Fixture to mock yt_dlp.YoutubeDL, with call counts reset for each test."""
+    _youtube_dl_instance.reset_mock()
+    return _youtube_dl_instance
+
+
+@pytest.fixture(scope="module")
+def output_dir(tmp_path_factory):
+    """
+    Output directory shared by the tests that only pass URLs: downloads are
+    mocked, so nothing is written there and one directory per module suffices.
+    """
+    return tmp_path_factory.mktemp("downloads")
+
+
 # --- Tests for YAML File Mode ---
 
 
@@ -54,7 +65,7 @@ artists:
     config_file = tmp_path / "config.yml"
     config_file.write_text(yaml_content)
     result = runner.invoke(
-        app, ["--lang", "en", "import", str(config_file), "--output-dir", str(tmp_path)]
+        app, [*IMPORT_ARGS, str(config_file), "--output-dir", str(tmp_path)]
     )
     assert result.exit_code == 0, result.stdout
     assert "Processing artist: Artist With Playlist" in result.stdout
@@ -65,29 +76,15 @@ artists:
 @patch(
     "adapters.ytdlp_adapter.YTDLPAdapter._is_tune_already_present", return_value=True
 )
-def test_import_yaml_skips_existing_with_green_flag(
-    mock_is_present, tmp_path, mock_youtube_dl
+def test_import_config_skips_existing_with_green_flag(
+    mock_is_present, tmp_path, mock_youtube_dl, capsys
 ):
-    """Checks that existing files are skipped in YAML mode with --green flag."""
-    yaml_content = 'artists:\n  - name: "Test Artist"\n    tunes: ["https://tune1"]'
-    config_file = tmp_path / "config.yml"
-    config_file.write_text(yaml_content)
+    """Checks that existing files are skipped when importing a config with green=True."""
+    config = {"artists": [{"name": "Test Artist", "tunes": ["https://tune1"]}]}
 
-    result = runner.invoke(
-        app,
-        [
-            "--lang",
-            "en",
-            "import",
-            str(config_file),
-            "--output-dir",
-            str(tmp_path),
-            "--green",
-        ],
-    )
+    _import_from_config(config, tmp_path, quality=0, flat=False, green=True)
 
-    assert result.exit_code == 0, result.stdout
-    assert "already exists" in result.stdout
+    assert "already exists" in capsys.readouterr().out
     mock_youtube_dl.download.assert_not_called()
     # The destination path includes the artist's name as a subfolder
     mock_is_present.assert_called_once_with(
@@ -99,98 +96,69 @@ def test_import_yaml_invalid_file(tmp_path):
     """Checks handling of an invalid YAML file."""
     config_file = tmp_path / "invalid.yml"
     config_file.write_text("artists: - name: 'Artist 1'")  # Invalid YAML
-    result = runner.invoke(app, ["--lang", "en", "import", str(config_file)])
+    result = runner.invoke(app, [*IMPORT_ARGS, str(config_file)])
     assert result.exit_code == 1, result.stdout
 
 
-# --- Tests for Direct CLI Mode (No YAML) ---
+def test_load_yaml_reuses_parse_of_unchanged_file(tmp_path):
+    """Checks that an unchanged YAML file is parsed once, and re-parsed after an edit."""
+    config_file = tmp_path / "config.yml"
+    config_file.write_text('artists:\n  - name: "Cached Artist"')
+    _parse_yaml_cached.cache_clear()
 
+    first = _load_yaml(config_file)
+    second = _load_yaml(config_file)
+    config_file.write_text('artists:\n  - name: "Edited Artist Name"')
+    third = _load_yaml(config_file)
 
-def test_import_cli_single_tune(tmp_path, mock_youtube_dl):
-    """Checks download of a single track via CLI options."""
-    result = runner.invoke(
-        app,
-        [
-            "--lang",
-            "en",
-            "import",
-            "--tune",
-            "https://tune1",
-            "--output-dir",
-            str(tmp_path),
-        ],
-    )
-    assert result.exit_code == 0, result.stdout
-    assert "tune1" in result.stdout
-    mock_youtube_dl.download.assert_called_once()
+    assert first is second
+    assert third["artists"][0]["name"] == "Edited Artist Name"
+    assert _parse_yaml_cached.cache_info().hits == 1
 
 
-def test_import_cli_single_playlist(tmp_path, mock_youtube_dl):
-    """Checks download of a single playlist via CLI options."""
-    result = runner.invoke(
-        app,
-        [
-            "--lang",
-            "en",
-            "import",
-            "--playlist",
-            "https://playlist1",
-            "--output-dir",
-            str(tmp_path),
-        ],
-    )
-    assert result.exit_code == 0, result.stdout
-    assert "playlist1" in result.stdout
-    mock_youtube_dl.download.assert_called_once()
+# --- Tests for Direct CLI Mode (No YAML) ---
 
 
-def test_import_cli_multiple_sources(tmp_path, mock_youtube_dl):
-    """Checks download from multiple --tune and --playlist options."""
+@pytest.mark.parametrize(
+    "sources, expected_downloads",
+    [
+        (list(TUNE1_ARGS), 1),
+        (["--playlist", "https://playlist1"], 1),
+        (
+            [*TUNE1_ARGS, "--playlist", "https://playlist1", "--tune", "https://tune2"],
+            3,
+        ),
+    ],
+    ids=["single_tune", "single_playlist", "multiple_sources"],
+)
+def test_import_cli_sources(output_dir, mock_youtube_dl, sources, expected_downloads):
+    """Checks download of tracks and playlists given via --tune/--playlist options."""
     result = runner.invoke(
         app,
-        [
-            "--lang",
-            "en",
-            "import",
-            "--tune",
-            "https://tune1",
-            "--playlist",
-            "https://playlist1",
-            "--tune",
-            "https://tune2",
-            "--output-dir",
-            str(tmp_path),
-        ],
+        [*IMPORT_ARGS, *sources, "--output-dir", str(output_dir)],
     )
     assert result.exit_code == 0, result.stdout
-    # 1 call for tune1, 1 for playlist1, 1 for tune2
-    assert mock_youtube_dl.download.call_count == 3
+    for url in sources[1::2]:
+        assert url.replace("https://", "") in result.stdout
+    # One download call per --tune / --playlist option
+    assert mock_youtube_dl.download.call_count == expected_downloads
 
 
 @patch(
     "adapters.ytdlp_adapter.YTDLPAdapter._is_tune_already_present", return_value=True
 )
 def test_import_cli_skips_existing_with_green_flag(
-    mock_is_present, tmp_path, mock_youtube_dl
+    mock_is_present, output_dir, mock_youtube_dl
 ):
     """Checks that existing files are skipped in CLI mode with --green."""
     result = runner.invoke(
         app,
-        [
-            "--lang",
-            "en",
-            "import",
-            "--tune",
-            "https://tune1",
-            "--output-dir",
-            str(tmp_path),
-            "--green",
-        ],
+        [*IMPORT_ARGS, *TUNE1_ARGS, "--output-dir", str(output_dir), "--green"],
     )
     assert result.exit_code == 0, result.stdout
     assert "already exists" in result.stdout
     mock_youtube_dl.download.assert_not_called()
-    mock_is_present.assert_called_once_with("https://tune1", str(tmp_path))
+    mock_is_present.assert_called_once_with("https://tune1", str(output_dir))
 
 
 # --- General Tests ---
@@ -198,7 +166,7 @@ def test_import_cli_skips_existing_with_green_flag(
 
 def test_import_no_input_fails():
     """Checks that the command fails if no source is provided."""
-    result = runner.invoke(app, ["--lang", "en", "import"])
+    result = runner.invoke(app, list(IMPORT_ARGS))
     assert result.exit_code == 1, result.stdout
     assert "You must provide a YAML file or at least one URL" in result.stdout
 
@@ -211,9 +179,7 @@ def test_import_yaml_and_cli_uses_both(tmp_path, mock_youtube_dl):
     result = runner.invoke(
         app,
         [
-            "--lang",
-            "en",
-            "import",
+            *IMPORT_ARGS,
             str(config_file),
             "--tune",
             "https://tune_cli",
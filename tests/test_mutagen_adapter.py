@@ -1,18 +1,14 @@
+import logging
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 from pathlib import Path
 
-from mutagen.id3 import ID3NoHeaderError
 from adapters.mutagen_adapter import MutagenAdapter
-from logger_config import setup_logger
 
-# Setup logger for tests
-setup_logger()
 
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mutagen_adapter():
-    """Provides a MutagenAdapter instance."""
+    """Provides a MutagenAdapter instance, shared since the adapter is stateless."""
     return MutagenAdapter()
 
 
@@ -25,74 +21,109 @@ def test_get_comment_file_not_found(mutagen_adapter, caplog):
     non_existent_file = Path("/non/existent/file.mp3")
     result = mutagen_adapter.get_comment(non_existent_file)
     assert result is None
-    assert "Error" not in caplog.text
+    assert not any(r.levelno >= logging.ERROR for r in caplog.records)
 
 
-@patch("pathlib.Path.exists", return_value=True)
-@patch("adapters.mutagen_adapter.ID3")
-def test_get_comment_success(mock_id3_class, mock_exists, mutagen_adapter):
+def test_get_comment_success(mocker, mutagen_adapter, tmp_path):
     """
     Given a valid MP3 file with a comment,
     When get_comment is called,
     Then it should return the comment text.
     """
+    mock_id3_class = mocker.patch("adapters.mutagen_adapter.ID3")
     # Mock the instance returned by the ID3 constructor
     mock_audio_instance = MagicMock()
     mock_audio_instance.getall.return_value = [MagicMock(text=["Test Comment"])]
     mock_id3_class.return_value = mock_audio_instance
 
-    result = mutagen_adapter.get_comment(Path("fake.mp3"))
+    mp3_file = tmp_path / "fake.mp3"
+    mp3_file.touch()
+
+    result = mutagen_adapter.get_comment(mp3_file)
 
     assert result == "Test Comment"
-    mock_id3_class.assert_called_once_with(Path("fake.mp3"))
+    mock_id3_class.assert_called_once_with(mp3_file)
     mock_audio_instance.getall.assert_called_once_with("COMM")
 
 
-@patch("pathlib.Path.exists", return_value=True)
-@patch("adapters.mutagen_adapter.ID3")
-def test_get_comment_no_comment_frame(mock_id3_class, mock_exists, mutagen_adapter):
+def test_get_comment_reuses_parse_of_unchanged_file(mocker, mutagen_adapter, tmp_path):
+    """
+    Given an MP3 file whose comment was already read,
+    When get_comment is called again without the file changing,
+    Then the ID3 tag should not be parsed a second time, but it should be
+    after the file is rewritten.
+    """
+    mock_id3_class = mocker.patch("adapters.mutagen_adapter.ID3")
+    mock_id3_class.return_value.getall.return_value = [MagicMock(text=["Comment"])]
+    mp3_file = tmp_path / "cached.mp3"
+    mp3_file.touch()
+
+    first = mutagen_adapter.get_comment(mp3_file)
+    second = mutagen_adapter.get_comment(mp3_file)
+    mp3_file.write_bytes(b"rewritten")
+    mutagen_adapter.get_comment(mp3_file)
+
+    assert first == second == "Comment"
+    assert mock_id3_class.call_count == 2
+
+
+def test_get_comment_no_comment_frame(mocker, mutagen_adapter, tmp_path):
     """
     Given an MP3 file without a comment frame,
     When get_comment is called,
     Then it should return None.
     """
+    mock_id3_class = mocker.patch("adapters.mutagen_adapter.ID3")
     mock_audio_instance = MagicMock()
     mock_audio_instance.getall.return_value = []  # No comment frames
     mock_id3_class.return_value = mock_audio_instance
+    mp3_file = tmp_path / "fake.mp3"
+    mp3_file.touch()
 
-    result = mutagen_adapter.get_comment(Path("fake.mp3"))
+    result = mutagen_adapter.get_comment(mp3_file)
 
     assert result is None
 
 
-@patch("pathlib.Path.exists", return_value=True)
-@patch("adapters.mutagen_adapter.ID3", side_effect=ID3NoHeaderError("No ID3 header"))
-def test_get_comment_no_id3_header(
-    mock_id3_class, mock_exists, mutagen_adapter, caplog
-):
+def test_get_comment_no_id3_header(mocker, mutagen_adapter, caplog, tmp_path):
     """
     Given a file without an ID3 header,
     When get_comment is called,
     Then it should return None and log a warning.
     """
-    result = mutagen_adapter.get_comment(Path("fake_no_header.mp3"))
+    from mutagen.id3 import ID3NoHeaderError
+
+    mocker.patch(
+        "adapters.mutagen_adapter.ID3", side_effect=ID3NoHeaderError("No ID3 header")
+    )
+    caplog.set_level(logging.WARNING)
+    mp3_file = tmp_path / "fake_no_header.mp3"
+    mp3_file.touch()
+
+    result = mutagen_adapter.get_comment(mp3_file)
 
     assert result is None
-    assert "does not have an ID3 header" in caplog.text
+    assert any("does not have an ID3 header" in r.getMessage() for r in caplog.records)
 
 
-@patch("pathlib.Path.exists", return_value=True)
-@patch("adapters.mutagen_adapter.ID3", side_effect=Exception("Generic Mutagen Error"))
-def test_get_comment_generic_exception(
-    mock_id3_class, mock_exists, mutagen_adapter, caplog
-):
+def test_get_comment_generic_exception(mocker, mutagen_adapter, caplog, tmp_path):
     """
     Given a file that causes a generic exception in Mutagen,
     When get_comment is called,
     Then it should return None and log an error.
     """
-    result = mutagen_adapter.get_comment(Path("fake_error.mp3"))
+    mocker.patch(
+        "adapters.mutagen_adapter.ID3", side_effect=Exception("Generic Mutagen Error")
+    )
+    caplog.set_level(logging.ERROR)
+    mp3_file = tmp_path / "fake_error.mp3"
+    mp3_file.touch()
+
+    result = mutagen_adapter.get_comment(mp3_file)
 
     assert result is None
-    assert "Error reading comment" in caplog.text
-    assert "Generic Mutagen Error" in caplog.text
+    assert any(
+        "Error reading comment" in r.getMessage()
+        and "Generic Mutagen Error" in r.getMessage()
+        for r in caplog.records
+    )
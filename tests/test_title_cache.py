@@ -0,0 +1,67 @@
+from adapters.title_cache import TitleCache
+
+
+def test_titles_persist_across_instances(tmp_path):
+    """
+    Given a title stored by one cache instance,
+    When a new instance reads the same file,
+    Then the title should be found.
+    """
+    path = tmp_path / "cache" / "titles.json"
+    cache = TitleCache(path)
+    cache.set("abc123def45", "Some Tune")
+    cache.flush()
+
+    assert TitleCache(path).get("abc123def45") == "Some Tune"
+    assert TitleCache(path).get("unknown0000") is None
+
+
+def test_corrupt_file_starts_empty_cache(tmp_path):
+    """
+    Given a cache file that is not valid JSON,
+    When the cache is read and then written,
+    Then it should behave as empty and be replaced by a valid file.
+    """
+    path = tmp_path / "titles.json"
+    path.write_text("{not json", encoding="utf-8")
+    cache = TitleCache(path)
+
+    assert cache.get("abc123def45") is None
+    cache.set("abc123def45", "Some Tune")
+    cache.flush()
+    assert TitleCache(path).get("abc123def45") == "Some Tune"
+
+
+def test_least_recently_used_entries_are_dropped(tmp_path):
+    """
+    Given a full cache whose oldest entry was just looked up,
+    When another title is stored,
+    Then the least recently used entry should be dropped instead.
+    """
+    path = tmp_path / "titles.json"
+    cache = TitleCache(path, max_entries=2)
+    cache.set("first000000", "first")
+    cache.set("second00000", "second")
+    assert cache.get("first000000") == "first"
+    cache.set("third000000", "third")
+    cache.flush()
+
+    reloaded = TitleCache(path)
+    assert reloaded.get("second00000") is None
+    assert reloaded.get("first000000") == "first"
+    assert reloaded.get("third000000") == "third"
+
+
+def test_set_writes_only_on_flush(tmp_path):
+    """
+    Given new titles stored in the cache,
+    When flush has not been called,
+    Then nothing should be written to disk.
+    """
+    path = tmp_path / "titles.json"
+    cache = TitleCache(path)
+    cache.set("abc123def45", "Some Tune")
+
+    assert not path.exists()
+    cache.flush()
+    assert path.exists()
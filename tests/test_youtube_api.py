@@ -1,168 +1,273 @@
-from unittest.mock import MagicMock
-from youtube_api import create_playlist, delete_playlist, get_playlist_url
+import logging
+import pytest
+from types import SimpleNamespace
+import youtube_api
+from youtube_api import (
+    batch_operations,
+    create_playlist,
+    delete_playlist,
+    get_playlist_url,
+)
 from domain.errors import YouTubeApiError
 from googleapiclient.errors import HttpError
+from httplib2 import Response
+from tests._assertions import assert_left
 
 
-# Scenario 1: Successful playlist creation
-def test_create_playlist_success(mocker, caplog):
+@pytest.fixture
+def build_stub(monkeypatch):
     """
-    Checks that playlist creation calls the API with the correct parameters
-    and returns a Right(playlist_id) on success.
+    Replaces googleapiclient.discovery.build; tests put the service it
+    should return under the "service" key of the returned dict and read
+    the number of build() calls under "builds". The service cache starts empty.
+    """
+    holder = {"builds": 0}
+
+    def build(*args, **kwargs):
+        holder["builds"] += 1
+        return holder["service"]
+
+    monkeypatch.setattr(youtube_api, "_service_cache", None)
+    monkeypatch.setattr("googleapiclient.discovery.build", build)
+    return holder
+
+
+PLAYLIST_ID = "PL123456789"
+# build() is stubbed, so the credentials are never inspected beyond this attribute
+CREDENTIALS = SimpleNamespace(universe_domain="googleapis.com")
+
+# (operation, arguments after credentials, API response, expected Right value,
+#  expected (method, kwargs) call on playlists(), expected info log)
+SUCCESS_CASES = [
+    pytest.param(
+        create_playlist,
+        ("Test Title", "Test Description", True),
+        {"id": PLAYLIST_ID, "snippet": {"title": "My Test Playlist"}},
+        PLAYLIST_ID,
+        (
+            "insert",
+            {
+                "part": "snippet,status",
+                "body": {
+                    "snippet": {
+                        "title": "Test Title",
+                        "description": "Test Description",
+                    },
+                    "status": {"privacyStatus": "private"},
+                },
+            },
+        ),
+        f"Playlist '{PLAYLIST_ID}' created successfully.",
+        id="create",
+    ),
+    pytest.param(
+        delete_playlist,
+        (PLAYLIST_ID,),
+        None,  # Deletion returns nothing
+        f"Playlist '{PLAYLIST_ID}' deleted successfully.",
+        ("delete", {"id": PLAYLIST_ID}),
+        f"Playlist '{PLAYLIST_ID}' deleted successfully.",
+        id="delete",
+    ),
+    pytest.param(
+        get_playlist_url,
+        (PLAYLIST_ID,),
+        {"items": [{"id": PLAYLIST_ID}]},
+        f"https://www.youtube.com/playlist?list={PLAYLIST_ID}",
+        ("list", {"part": "id", "id": PLAYLIST_ID}),
+        f"URL for playlist '{PLAYLIST_ID}' retrieved successfully.",
+        id="get_url",
+    ),
+]
+
+
+# Scenario 1: Successful creation, deletion and URL retrieval
+@pytest.mark.parametrize(
+    "operation, args, api_response, expected_value, expected_call, expected_log",
+    SUCCESS_CASES,
+)
+def test_playlist_operation_success(
+    build_stub,
+    caplog,
+    fake_youtube,
+    operation,
+    args,
+    api_response,
+    expected_value,
+    expected_call,
+    expected_log,
+):
+    """
+    Checks that each operation calls the API with the correct parameters
+    and returns a Right with the expected value on success.
     LDD: Verifies info logs.
     """
-    mock_credentials = MagicMock()
-    mock_credentials.universe_domain = "googleapis.com"
 
-    # Simulate the API call chain
-    mock_insert = MagicMock()
-    api_response = {"id": "PL123456789", "snippet": {"title": "My Test Playlist"}}
-    mock_insert.execute.return_value = api_response
+    youtube = fake_youtube(result=api_response)
+    build_stub["service"] = youtube
 
-    mock_playlists = MagicMock()
-    mock_playlists.insert.return_value = mock_insert
+    result = operation(CREDENTIALS, *args)
 
-    mock_youtube_service = MagicMock()
-    mock_youtube_service.playlists.return_value = mock_playlists
+    assert result.is_right()
+    assert result.value == expected_value
+    assert youtube.calls == [expected_call]
+    assert any(expected_log in r.getMessage() for r in caplog.records)
 
-    mocker.patch("youtube_api.build", return_value=mock_youtube_service)
 
-    result = create_playlist(
-        mock_credentials, "Test Title", "Test Description", private=True
+def _http_error(status, reason, content):
+    """Builds an HttpError as raised by execute() for the given response."""
+    return HttpError(
+        resp=Response({"status": status, "reason": reason}), content=content
     )
 
-    assert result.is_right()
-    assert result.value == "PL123456789"
-
-    # Check that the API was called correctly
-    mock_playlists.insert.assert_called_once_with(
-        part="snippet,status",
-        body={
-            "snippet": {"title": "Test Title", "description": "Test Description"},
-            "status": {"privacyStatus": "private"},
-        },
-    )
-    assert "Playlist 'PL123456789' created successfully." in caplog.text
-
 
-# Scenario 2: Playlist creation failure (API error)
-def test_create_playlist_api_error(mocker, caplog):
+# (operation, arguments after credentials, API response, raised error,
+#  expected fragment of the error message, expected error log fragment)
+ERROR_CASES = [
+    pytest.param(
+        create_playlist,
+        ("Title", "Description", False),
+        None,
+        _http_error(403, "Forbidden", b"Permission denied"),
+        "Permission denied",
+        "Failed to create playlist 'Title'",
+        id="create_forbidden",
+    ),
+    pytest.param(
+        create_playlist,
+        ("Title", "Description", False),
+        None,
+        _http_error(502, "Bad Gateway", b"\xff\xfeBad gateway"),
+        "Bad gateway",
+        "Failed to create playlist 'Title'",
+        id="create_non_utf8_body",
+    ),
+    pytest.param(
+        delete_playlist,
+        ("PL_NON_EXISTENT",),
+        None,
+        _http_error(404, "Not Found", b"Playlist not found."),
+        "Playlist not found",
+        "Failed to delete playlist 'PL_NON_EXISTENT'",
+        id="delete_not_found",
+    ),
+    pytest.param(
+        get_playlist_url,
+        (PLAYLIST_ID,),
+        None,
+        _http_error(500, "Internal Server Error", b"Backend error"),
+        "Backend error",
+        f"Failed to retrieve URL for playlist '{PLAYLIST_ID}'",
+        id="get_url_api_error",
+    ),
+    pytest.param(
+        get_playlist_url,
+        ("PL_NON_EXISTENT",),
+        {"items": []},
+        None,
+        "Playlist 'PL_NON_EXISTENT' not found.",
+        "Failed to retrieve URL",
+        id="get_url_not_found",
+    ),
+]
+
+
+# Scenario 2: API errors and missing playlists
+@pytest.mark.parametrize(
+    "operation, args, api_response, error, expected_message, expected_log",
+    ERROR_CASES,
+)
+def test_playlist_operation_error(
+    build_stub,
+    caplog,
+    fake_youtube,
+    operation,
+    args,
+    api_response,
+    error,
+    expected_message,
+    expected_log,
+):
     """
-    Checks that the function returns a Left on API error.
+    Checks that each operation returns a Left(YouTubeApiError) when the API
+    fails or the playlist does not exist.
     LDD: Verifies error logs.
     """
-    mock_credentials = MagicMock()
-    mock_credentials.universe_domain = "googleapis.com"
-
-    # Simulate a realistic HTTP error response
-    mock_http_resp = MagicMock()
-    mock_http_resp.status = 403
-    mock_http_resp.reason = "Forbidden"
+    caplog.set_level(logging.ERROR)
+    build_stub["service"] = fake_youtube(result=api_response, error=error)
 
-    http_error = HttpError(resp=mock_http_resp, content=b"Permission denied")
+    result = operation(CREDENTIALS, *args)
 
-    mock_youtube_service = MagicMock()
-    mock_youtube_service.playlists().insert().execute.side_effect = http_error
+    assert_left(result, YouTubeApiError, expected_message)
+    assert any(expected_log in r.getMessage() for r in caplog.records)
 
-    mocker.patch("youtube_api.build", return_value=mock_youtube_service)
 
-    result = create_playlist(mock_credentials, "Title", "Description", private=False)
-
-    assert result.is_left()
-    error_value, _ = result.monoid
-    assert isinstance(error_value, YouTubeApiError)
-    assert "Permission denied" in error_value.message
-    assert "Failed to create playlist" in caplog.text
-    assert "Permission denied" in caplog.text
-
-
-# Scenario 3: Successful playlist deletion
-def test_delete_playlist_success(mocker, caplog):
+def test_service_is_built_once_per_credentials(build_stub, fake_youtube):
     """
-    Checks that playlist deletion calls the API with the correct ID
-    and returns a Right with a success message.
-    LDD: Verifies info logs.
+    Checks that consecutive operations with the same credentials reuse
+    the service built by the first one, and that only the last service is kept.
     """
-    mock_credentials = MagicMock()
-    mock_credentials.universe_domain = "googleapis.com"
-    playlist_id = "PL123456789"
+    build_stub["service"] = fake_youtube(result={"items": [{"id": PLAYLIST_ID}]})
 
-    mock_delete_execute = MagicMock(return_value=None)  # Deletion returns nothing
-    mock_delete = MagicMock()
-    mock_delete.execute = mock_delete_execute
+    get_playlist_url(CREDENTIALS, PLAYLIST_ID)
+    delete_playlist(CREDENTIALS, PLAYLIST_ID)
+    assert build_stub["builds"] == 1
 
-    mock_playlists = MagicMock()
-    mock_playlists.delete.return_value = mock_delete
+    get_playlist_url(SimpleNamespace(universe_domain="googleapis.com"), PLAYLIST_ID)
+    get_playlist_url(CREDENTIALS, PLAYLIST_ID)
+    assert build_stub["builds"] == 3
 
-    mock_youtube_service = MagicMock()
-    mock_youtube_service.playlists.return_value = mock_playlists
 
-    mocker.patch("youtube_api.build", return_value=mock_youtube_service)
-
-    result = delete_playlist(mock_credentials, playlist_id)
-
-    assert result.is_right()
-    assert result.value == f"Playlist '{playlist_id}' deleted successfully."
-    mock_playlists.delete.assert_called_once_with(id=playlist_id)
-    assert f"Playlist '{playlist_id}' deleted successfully." in caplog.text
-
-
-# Scenario 4: Deletion failure (playlist not found)
-def test_delete_playlist_not_found_error(mocker, caplog):
+def test_batch_operations_send_one_request_per_batch(
+    build_stub, fake_youtube, monkeypatch
+):
     """
-    Checks that the function returns a Left(YouTubeApiError) if the playlist does not exist.
-    LDD: Verifies error logs.
+    Checks that operations are grouped into batches of BATCH_SIZE requests
+    and that one Right per operation is returned, in order.
     """
-    mock_credentials = MagicMock()
-    mock_credentials.universe_domain = "googleapis.com"
-    playlist_id = "PL_NON_EXISTENT"
-
-    mock_http_resp = MagicMock()
-    mock_http_resp.status = 404
-    mock_http_resp.reason = "Not Found"
-
-    http_error = HttpError(resp=mock_http_resp, content=b"Playlist not found.")
-
-    mock_youtube_service = MagicMock()
-    mock_youtube_service.playlists().delete().execute.side_effect = http_error
-
-    mocker.patch("youtube_api.build", return_value=mock_youtube_service)
+    monkeypatch.setattr(youtube_api, "BATCH_SIZE", 2)
+    youtube = fake_youtube(result={"items": []})
+    build_stub["service"] = youtube
+    operations = [("delete", {"id": f"PL{i}"}) for i in range(3)]
 
-    result = delete_playlist(mock_credentials, playlist_id)
+    results = batch_operations(CREDENTIALS, operations)
 
-    assert result.is_left()
-    error_value, _ = result.monoid
-    assert isinstance(error_value, YouTubeApiError)
-    assert "Playlist not found" in error_value.message
-    assert f"Failed to delete playlist '{playlist_id}'" in caplog.text
+    assert [r.is_right() for r in results] == [True, True, True]
+    assert youtube.batches == 2
+    assert youtube.calls == operations
 
 
-# Scenario 6: Get share URL successfully
-def test_get_playlist_url_success(mocker, caplog):
+def test_batch_operations_report_api_errors(build_stub, fake_youtube):
     """
-    Checks that the function returns a Right with the playlist URL.
-    LDD: Verifies info logs.
+    Checks that an API error is returned as a Left(YouTubeApiError)
+    for each operation it affected.
     """
-    mock_credentials = MagicMock()
-    mock_credentials.universe_domain = "googleapis.com"
-    playlist_id = "PL123456789"
-    expected_url = f"https://www.youtube.com/playlist?list={playlist_id}"
+    build_stub["service"] = fake_youtube(
+        error=_http_error(404, "Not Found", b"Playlist not found.")
+    )
 
-    # Simulate the API response (even though we don't use it directly)
-    mock_list_execute = MagicMock(return_value={"items": [{"id": playlist_id}]})
-    mock_list = MagicMock()
-    mock_list.execute = mock_list_execute
+    results = batch_operations(CREDENTIALS, [("delete", {"id": PLAYLIST_ID})])
 
-    mock_playlists = MagicMock()
-    mock_playlists.list.return_value = mock_list
+    assert_left(results[0], YouTubeApiError, "Playlist not found")
 
-    mock_youtube_service = MagicMock()
-    mock_youtube_service.playlists.return_value = mock_playlists
 
-    mocker.patch("youtube_api.build", return_value=mock_youtube_service)
+def test_batch_operations_report_unanswered_operations(
+    build_stub, fake_youtube, monkeypatch
+):
+    """
+    Checks that an operation whose batch callback never fires is returned
+    as a Left(YouTubeApiError) rather than None.
+    """
+    youtube = fake_youtube(result={})
+    monkeypatch.setattr(
+        youtube,
+        "new_batch_http_request",
+        lambda callback: SimpleNamespace(
+            add=lambda request, request_id: None, execute=lambda: None
+        ),
+    )
+    build_stub["service"] = youtube
 
-    result = get_playlist_url(mock_credentials, playlist_id)
+    results = batch_operations(CREDENTIALS, [("delete", {"id": PLAYLIST_ID})])
 
-    assert result.is_right()
-    assert result.value == expected_url
-    assert f"URL for playlist '{playlist_id}' retrieved successfully." in caplog.text
+    assert_left(results[0], YouTubeApiError, "No response received")
@@ -1,110 +1,115 @@
 import pytest
 from unittest.mock import patch, MagicMock
-from pathlib import Path
 
+from adapters.concurrency import AIMDController
+from adapters.title_cache import TitleCache
 from adapters.ytdlp_adapter import YTDLPAdapter
 from domain.models import Playlist
 from domain.errors import DownloaderError
-from logger_config import setup_logger
+from tests._assertions import assert_left
 
-# Setup logger for tests
-setup_logger()
+# Postprocessor chain every download is expected to run, in order.
+EXPECTED_POSTPROCESSOR_KEYS = [
+    "FFmpegExtractAudio",
+    "EmbedThumbnail",
+    "FFmpegMetadata",
+    "ModifyTags",
+]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def ytdlp_adapter():
-    """Fixture to provide a YTDLPAdapter instance."""
+    """
+    Fixture to provide a YTDLPAdapter instance, built once for the session.
+    Tests patch its collaborators through monkeypatch so they are restored.
+    """
     return YTDLPAdapter()
 
 
+@pytest.fixture(scope="module")
+def playlist():
+    """Provides the (frozen) playlist shared by the download_playlist tests."""
+    return Playlist(
+        playlist_id="PL12345",
+        title="Test Playlist",
+        url="https://www.youtube.com/playlist?list=PL12345",
+    )
+
+
 @patch(
     "adapters.ytdlp_adapter.YTDLPAdapter._is_tune_already_present", return_value=False
 )
-@patch("yt_dlp.YoutubeDL")
-def test_download_tune_success(mock_ytdl, mock_is_present, ytdlp_adapter, caplog):
+def test_download_tune_success(mock_is_present, fake_ytdl, ytdlp_adapter, caplog):
     """
     Given a valid tune URL,
     When download_tune is called,
     Then it should successfully download the tune.
     """
-    mock_instance = MagicMock()
-    mock_ytdl.return_value.__enter__.return_value = mock_instance
-    mock_instance.extract_info.return_value = {"title": "Test Tune", "id": "123"}
-    mock_instance.download.return_value = 0  # Success
+    fake_ytdl.next_info = {"title": "Test Tune", "id": "123"}
 
     result = ytdlp_adapter.download_tune("fake_url", "/fake/path")
 
     assert result.is_right()
     assert "Test Tune" in result.value
-    assert "Skipping download" not in caplog.text
+    assert not any("Skipping download" in r.getMessage() for r in caplog.records)
     mock_is_present.assert_not_called()  # Should not be called if green=False
-    mock_instance.download.assert_called_once()
+    assert fake_ytdl.downloads == [["https://www.youtube.com/watch?v=123"]]
 
 
 @patch(
     "adapters.ytdlp_adapter.YTDLPAdapter._is_tune_already_present", return_value=True
 )
-@patch("yt_dlp.YoutubeDL")
 def test_download_tune_green_tune_exists(
-    mock_ytdl, mock_is_present, ytdlp_adapter, caplog
+    mock_is_present, fake_ytdl, ytdlp_adapter, caplog
 ):
     """
     Given a tune URL and green=True,
     When the tune's URL is already present in the destination,
     Then it should skip the download.
     """
-    mock_instance = MagicMock()
-    mock_ytdl.return_value.__enter__.return_value = mock_instance
-
     result = ytdlp_adapter.download_tune(
         "http://matching.url", "/fake/path", green=True
     )
 
     assert result.is_right()
     assert "already exists" in result.value
-    assert "Skipping download" in caplog.text
+    assert any("Skipping download" in r.getMessage() for r in caplog.records)
     mock_is_present.assert_called_once_with("http://matching.url", "/fake/path")
-    mock_instance.download.assert_not_called()
+    # No YoutubeDL was built: neither extract_info nor download ran
+    assert fake_ytdl.opts is None
+    assert fake_ytdl.downloads == []
 
 
 @patch(
     "adapters.ytdlp_adapter.YTDLPAdapter._is_tune_already_present", return_value=False
 )
-@patch("yt_dlp.YoutubeDL")
 def test_download_tune_green_tune_does_not_exist(
-    mock_ytdl, mock_is_present, ytdlp_adapter
+    mock_is_present, fake_ytdl, ytdlp_adapter
 ):
     """
     Given a tune URL and green=True,
     When the tune's URL is not present,
     Then it should download the tune.
     """
-    mock_instance = MagicMock()
-    mock_ytdl.return_value.__enter__.return_value = mock_instance
-    mock_instance.extract_info.return_value = {"title": "New Tune", "id": "789"}
-    mock_instance.download.return_value = 0
+    fake_ytdl.next_info = {"title": "New Tune", "id": "789"}
 
     result = ytdlp_adapter.download_tune("http://new.url", "/fake/path", green=True)
 
     assert result.is_right()
     mock_is_present.assert_called_once_with("http://new.url", "/fake/path")
-    mock_instance.download.assert_called_once()
+    assert len(fake_ytdl.downloads) == 1
 
 
 @patch(
     "adapters.ytdlp_adapter.YTDLPAdapter._is_tune_already_present", return_value=True
 )
-@patch("yt_dlp.YoutubeDL")
-def test_download_tune_no_green_tune_exists(mock_ytdl, mock_is_present, ytdlp_adapter):
+def test_download_tune_no_green_tune_exists(mock_is_present, fake_ytdl, ytdlp_adapter):
     """
     Given a tune URL and green=False,
     When the tune already exists,
     Then it should still download (overwrite).
     """
-    mock_instance = MagicMock()
-    mock_ytdl.return_value.__enter__.return_value = mock_instance
-    mock_instance.extract_info.return_value = {"title": "Overwrite Tune", "id": "101"}
-    mock_instance.download.return_value = 0
+    fake_ytdl.next_info = {"title": "Overwrite Tune", "id": "101"}
 
     result = ytdlp_adapter.download_tune(
         "http://existing.url", "/fake/path", green=False
@@ -112,210 +117,413 @@ def test_download_tune_no_green_tune_exists(mock_ytdl, mock_is_present, ytdlp_ad
 
     assert result.is_right()
     mock_is_present.assert_not_called()  # Green check is skipped
-    mock_instance.download.assert_called_once()
+    assert len(fake_ytdl.downloads) == 1
+
+
+def test_download_tune_uses_cached_title(fake_ytdl, tmp_path):
+    """
+    Given a tune whose title was cached by an earlier download,
+    When download_tune is called again for its URL,
+    Then the tune should be downloaded without extracting its info.
+    """
+    adapter = YTDLPAdapter(title_cache=TitleCache(tmp_path / "titles.json"))
+    url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    fake_ytdl.next_info = {"title": "Cached Tune", "id": "dQw4w9WgXcQ"}
+
+    adapter.download_tune(url, "/fake/path")
+    fake_ytdl.next_info = {}
+    result = adapter.download_tune(url, "/fake/path")
+
+    assert (
+        result.value == "Track 'Cached Tune' downloaded successfully to '/fake/path'."
+    )
+    assert fake_ytdl.extracted == [url]
+    assert len(fake_ytdl.downloads) == 2
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQX",
+        "https://youtu.be/dQw4w9WgXcQ123",
+    ],
+)
+def test_download_tune_ignores_cache_for_longer_id(fake_ytdl, tmp_path, url):
+    """
+    Given a cached title for an 11-character video ID,
+    When download_tune is called with a URL whose ID merely starts with it,
+    Then the info should still be extracted for that URL.
+    """
+    cache = TitleCache(tmp_path / "titles.json")
+    cache.set("dQw4w9WgXcQ", "Cached Tune")
+    adapter = YTDLPAdapter(title_cache=cache)
+    fake_ytdl.next_info = {"title": "Other Tune", "id": "other"}
+
+    adapter.download_tune(url, "/fake/path")
+
+    assert fake_ytdl.extracted == [url]
 
 
 # Tests for download_playlist
-def test_download_playlist_success(ytdlp_adapter, caplog):
+def test_download_playlist_success(ytdlp_adapter, fake_ytdl, playlist, caplog):
     """
     Given a valid playlist URL and a destination path,
     When the download_playlist method is called,
     Then it should return a Right with a success message
     And log the appropriate info messages.
     """
-    playlist_url = "https://www.youtube.com/playlist?list=PL12345"
     destination_path = "/fake/path"
-    playlist = Playlist(playlist_id="PL12345", title="Test Playlist", url=playlist_url)
-
-    with patch("yt_dlp.YoutubeDL") as mock_ytdl:
-        # Mock the context manager
-        mock_instance = MagicMock()
-        mock_ytdl.return_value.__enter__.return_value = mock_instance
-        mock_instance.download.return_value = 0  # Success code
 
-        # When
-        result = ytdlp_adapter.download_playlist(playlist, destination_path)
+    # When
+    result = ytdlp_adapter.download_playlist(playlist, destination_path)
 
-        # Then
-        assert result.is_right()
-        assert (
-            result.value
-            == f"Playlist '{playlist.title}' downloaded successfully to '{destination_path}'."
-        )
+    # Then
+    assert result.is_right()
+    assert (
+        result.value
+        == f"Playlist '{playlist.title}' downloaded successfully to '{destination_path}'."
+    )
 
-        # Check that YoutubeDL was called with the correct options
-        called_opts = mock_ytdl.call_args[0][0]
-        assert called_opts["format"] == "bestaudio/best"
-        assert called_opts["noplaylist"] is False
+    # Check that YoutubeDL was called with the correct options
+    called_opts = fake_ytdl.opts
+    assert called_opts["format"] == "bestaudio/best"
+    assert called_opts["noplaylist"] is False
+    assert called_opts["concurrent_fragment_downloads"] == 4
 
-        # Check postprocessors
-        pp_keys = [p["key"] for p in called_opts["postprocessors"]]
-        assert "FFmpegExtractAudio" in pp_keys
-        assert "EmbedThumbnail" in pp_keys
-        assert "FFmpegMetadata" in pp_keys
-        assert "ModifyTags" in pp_keys
+    # Check postprocessors
+    pp_keys = [p["key"] for p in called_opts["postprocessors"]]
+    assert pp_keys == EXPECTED_POSTPROCESSOR_KEYS
 
-        # Check that the download method was called
-        mock_instance.download.assert_called_once_with([playlist_url])
+    # Check that the download method was called
+    assert fake_ytdl.downloads == [[playlist.url]]
 
-        # Check logs
-        assert "Starting download of playlist 'Test Playlist'..." in caplog.text
-        assert f"Playlist '{playlist.title}' downloaded successfully." in caplog.text
+    # Check logs
+    messages = [r.getMessage() for r in caplog.records]
+    assert any(
+        "Starting download of playlist 'Test Playlist'..." in m for m in messages
+    )
+    assert any(
+        f"Playlist '{playlist.title}' downloaded successfully." in m for m in messages
+    )
 
 
-def test_download_playlist_download_error(ytdlp_adapter, caplog):
+@pytest.mark.parametrize(
+    "exit_code, error, expected_error, expected_log",
+    [
+        (
+            1,  # Error code
+            None,
+            "Error downloading playlist",
+            "Failed to download playlist 'Test Playlist' with exit code 1",
+        ),
+        (
+            0,
+            Exception("A nasty error occurred"),
+            "An unexpected error occurred: A nasty error occurred",
+            "Critical error during download: A nasty error occurred",
+        ),
+    ],
+    ids=["error_code", "exception"],
+)
+def test_download_playlist_failure(
+    ytdlp_adapter,
+    fake_ytdl,
+    playlist,
+    caplog,
+    exit_code,
+    error,
+    expected_error,
+    expected_log,
+):
     """
     Given a playlist URL,
-    When the download process fails (returns a non-zero code),
+    When the download process fails (non-zero code or raised exception),
     Then it should return a Left with an error message
     And log the appropriate error message.
     """
-    playlist_url = "https://www.youtube.com/playlist?list=PL12345"
     destination_path = "/fake/path"
-    playlist = Playlist(playlist_id="PL12345", title="Test Playlist", url=playlist_url)
 
-    with patch("yt_dlp.YoutubeDL") as mock_ytdl:
-        mock_instance = MagicMock()
-        mock_ytdl.return_value.__enter__.return_value = mock_instance
-        mock_instance.download.return_value = 1  # Error code
+    fake_ytdl.next_rc = exit_code
+    fake_ytdl.next_exc = error
+
+    # When
+    result = ytdlp_adapter.download_playlist(playlist, destination_path)
+
+    # Then
+    assert_left(result, DownloaderError, expected_error)
 
-        # When
-        result = ytdlp_adapter.download_playlist(playlist, destination_path)
+    # Check logs
+    messages = [r.getMessage() for r in caplog.records]
+    assert any(
+        "Starting download of playlist 'Test Playlist'..." in m for m in messages
+    )
+    assert any(expected_log in m for m in messages)
+
+
+@pytest.mark.parametrize(
+    "download",
+    [
+        lambda adapter, playlist: adapter.download_tune(
+            "http://tune.url", "/fake/path"
+        ),
+        lambda adapter, playlist: adapter.download_playlist(playlist, "/fake/path"),
+    ],
+    ids=["tune", "playlist"],
+)
+@pytest.mark.parametrize("exit_code, error", [(1, None), (0, Exception("boom"))])
+def test_failed_download_forgets_scanned_destination(
+    ytdlp_adapter, fake_ytdl, playlist, monkeypatch, download, exit_code, error
+):
+    """
+    Given a destination whose URLs were already scanned,
+    When a download into it fails or raises,
+    Then the scan should be dropped, since partial output may have been written.
+    """
+    monkeypatch.setitem(ytdlp_adapter._dir_url_cache, "/fake/path", {})
+    fake_ytdl.next_info = {"title": "Partial", "id": "999"}
+    fake_ytdl.next_rc = exit_code
+    fake_ytdl.next_exc = error
 
-        # Then
-        assert result.is_left()
-        error_value, _ = result.monoid
-        assert isinstance(error_value, DownloaderError)
-        assert "Error downloading playlist" in error_value.message
+    result = download(ytdlp_adapter, playlist)
 
-        # Check logs
-        assert "Starting download of playlist 'Test Playlist'..." in caplog.text
-        assert (
-            "Failed to download playlist 'Test Playlist' with exit code 1"
-            in caplog.text
-        )
+    assert result.is_left()
+    assert "/fake/path" not in ytdlp_adapter._dir_url_cache
 
 
-def test_download_playlist_with_green_option(ytdlp_adapter):
+def test_download_playlist_with_green_option(ytdlp_adapter, fake_ytdl, playlist):
     """
     Checks that the 'no_overwrites' option is passed correctly to yt-dlp when green=True.
     """
-    playlist = Playlist(
-        playlist_id="PL12345", title="Test Playlist", url="http://fake.url"
-    )
     destination_path = "/fake/path"
 
-    with patch("yt_dlp.YoutubeDL") as mock_ytdl:
-        mock_instance = MagicMock()
-        mock_ytdl.return_value.__enter__.return_value = mock_instance
-        mock_instance.download.return_value = 0
+    ytdlp_adapter.download_playlist(playlist, destination_path, green=True)
+
+    # Check that 'no_overwrites' is True
+    assert fake_ytdl.opts["no_overwrites"] is True
+
 
-        ytdlp_adapter.download_playlist(playlist, destination_path, green=True)
+def test_download_tunes_parallel_returns_one_result_per_url(ytdlp_adapter, fake_ytdl):
+    """
+    Given several tune URLs,
+    When download_tunes_parallel is called,
+    Then every tune should be downloaded, reported as it finishes,
+    and one Right returned per URL.
+    """
+    fake_ytdl.next_info = {"title": "Parallel Tune", "id": "456"}
+    urls = ["http://tune.url/1", "http://tune.url/2", "http://tune.url/3"]
+    reported = []
+
+    results = ytdlp_adapter.download_tunes_parallel(
+        urls,
+        "/fake/path",
+        max_workers=2,
+        on_result=lambda url, result: reported.append((url, result.is_right())),
+    )
 
-        # Check that 'no_overwrites' is True
-        args, kwargs = mock_ytdl.call_args
-        assert args[0]["no_overwrites"] is True
+    assert len(results) == len(urls)
+    assert all(result.is_right() for result in results)
+    assert len(fake_ytdl.downloads) == len(urls)
+    assert sorted(reported) == [(url, True) for url in urls]
 
 
-def test_download_playlist_exception(ytdlp_adapter, caplog):
+def test_download_tunes_parallel_with_controller_reports_progress(
+    ytdlp_adapter, fake_ytdl
+):
     """
-    Given a playlist URL,
-    When the download process raises an exception,
-    Then it should return a Left with an error message
-    And log the appropriate critical error message.
+    Given an adaptive concurrency controller,
+    When download_tunes_parallel is called,
+    Then every tune should be downloaded with the controller's progress hook.
     """
-    playlist_url = "https://www.youtube.com/playlist?list=PL12345"
-    destination_path = "/fake/path"
-    playlist = Playlist(playlist_id="PL12345", title="Test Playlist", url=playlist_url)
-    error_message = "A nasty error occurred"
+    fake_ytdl.next_info = {"title": "Adaptive Tune", "id": "321"}
+    controller = AIMDController(initial=1, interval=0.01)
+    urls = ["http://tune.url/1", "http://tune.url/2"]
 
-    with patch("yt_dlp.YoutubeDL") as mock_ytdl:
-        mock_instance = MagicMock()
-        mock_ytdl.return_value.__enter__.return_value = mock_instance
-        mock_instance.download.side_effect = Exception(error_message)
+    results = ytdlp_adapter.download_tunes_parallel(
+        urls, "/fake/path", controller=controller
+    )
 
-        # When
-        result = ytdlp_adapter.download_playlist(playlist, destination_path)
+    assert len(results) == len(urls)
+    assert all(result.is_right() for result in results)
+    assert len(fake_ytdl.downloads) == len(urls)
+    assert fake_ytdl.opts["progress_hooks"] == [controller.progress_hook]
 
-        # Then
-        assert result.is_left()
-        error_value, _ = result.monoid
-        assert isinstance(error_value, DownloaderError)
-        assert f"An unexpected error occurred: {error_message}" in error_value.message
 
-        # Check logs
-        assert "Starting download of playlist 'Test Playlist'..." in caplog.text
-        assert f"Critical error during download: {error_message}" in caplog.text
+def test_download_playlist_with_workers_downloads_each_entry(
+    ytdlp_adapter, fake_ytdl, playlist
+):
+    """
+    Given max_workers > 1,
+    When download_playlist is called,
+    Then the playlist entries should be listed and downloaded one tune at a time.
+    """
+    fake_ytdl.next_info = {
+        "title": "Test Playlist",
+        "id": "789",
+        "entries": [{"url": "http://tune.url/1"}, {"url": "http://tune.url/2"}],
+    }
+
+    result = ytdlp_adapter.download_playlist(playlist, "/fake/path", max_workers=2)
+
+    assert result.is_right()
+    assert len(fake_ytdl.downloads) == 2
+    assert [playlist.url] not in fake_ytdl.downloads
+
+
+def test_ydl_opts_reuse_frozen_tagging_postprocessors(ytdlp_adapter):
+    """
+    Given two option dicts built for different qualities,
+    When their postprocessors are compared,
+    Then only the audio extraction should differ; the tagging entries are
+    the same read-only definitions, which cannot be changed through an opts dict.
+    """
+    first = ytdlp_adapter._get_ydl_opts("/a", "192", False, is_playlist=False)
+    second = ytdlp_adapter._get_ydl_opts("/b", "best", False, is_playlist=False)
+
+    assert first["postprocessors"][0]["preferredquality"] == "192"
+    assert second["postprocessors"][0]["preferredquality"] == "0"
+    for shared, other in zip(first["postprocessors"][1:], second["postprocessors"][1:]):
+        assert shared is other
+    with pytest.raises(TypeError):
+        first["postprocessors"][-1]["tags"]["comment"] = "changed"
+    assert second["verbose"] is False
 
 
 # --- Tests for _is_tune_already_present ---
 
 
-@patch("pathlib.Path.is_dir", return_value=True)
-@patch("pathlib.Path.glob")
-def test_is_tune_present_found(mock_glob, mock_is_dir, ytdlp_adapter):
+def test_is_tune_present_found(ytdlp_adapter, monkeypatch, tmp_path):
     """
     Given a directory containing an MP3 with a matching URL,
     When _is_tune_already_present is called,
     Then it should return True.
     """
-    mock_glob.return_value = [Path("/fake/path/song.mp3")]
-    ytdlp_adapter._mutagen_adapter.get_comment = MagicMock(
-        return_value="http://matching.url"
-    )
+    song = tmp_path / "song.mp3"
+    song.touch()
+    get_comment = MagicMock(return_value="http://matching.url")
+    monkeypatch.setattr(ytdlp_adapter._mutagen_adapter, "get_comment", get_comment)
 
-    result = ytdlp_adapter._is_tune_already_present("http://matching.url", "/fake/path")
+    result = ytdlp_adapter._is_tune_already_present(
+        "http://matching.url", str(tmp_path)
+    )
 
     assert result is True
-    ytdlp_adapter._mutagen_adapter.get_comment.assert_called_once_with(
-        Path("/fake/path/song.mp3")
-    )
+    get_comment.assert_called_once_with(song)
 
 
-@patch("pathlib.Path.is_dir", return_value=True)
-@patch("pathlib.Path.glob")
-def test_is_tune_present_not_found(mock_glob, mock_is_dir, ytdlp_adapter):
+def test_is_tune_present_not_found(ytdlp_adapter, monkeypatch, tmp_path):
     """
     Given a directory with MP3s but none with a matching URL,
     When _is_tune_already_present is called,
     Then it should return False.
     """
-    mock_glob.return_value = [
-        Path("/fake/path/song1.mp3"),
-        Path("/fake/path/song2.mp3"),
-    ]
-    ytdlp_adapter._mutagen_adapter.get_comment = MagicMock(
-        return_value="http://different.url"
-    )
+    (tmp_path / "song1.mp3").touch()
+    (tmp_path / "song2.mp3").touch()
+    get_comment = MagicMock(return_value="http://different.url")
+    monkeypatch.setattr(ytdlp_adapter._mutagen_adapter, "get_comment", get_comment)
 
-    result = ytdlp_adapter._is_tune_already_present("http://matching.url", "/fake/path")
+    result = ytdlp_adapter._is_tune_already_present(
+        "http://matching.url", str(tmp_path)
+    )
 
     assert result is False
-    assert ytdlp_adapter._mutagen_adapter.get_comment.call_count == 2
+    assert get_comment.call_count == 2
 
 
-@patch("pathlib.Path.is_dir", return_value=False)
-def test_is_tune_present_dir_not_exists(mock_is_dir, ytdlp_adapter):
+def test_is_tune_present_dir_not_exists(ytdlp_adapter, tmp_path):
     """
     Given a destination that is not a directory,
     When _is_tune_already_present is called,
     Then it should return False.
     """
-    result = ytdlp_adapter._is_tune_already_present("http://any.url", "/not/a/dir")
+    result = ytdlp_adapter._is_tune_already_present(
+        "http://any.url", str(tmp_path / "not_a_dir")
+    )
     assert result is False
 
 
-@patch("pathlib.Path.is_dir", return_value=True)
-@patch("pathlib.Path.glob", return_value=[])
-def test_is_tune_present_empty_dir(mock_glob, mock_is_dir, ytdlp_adapter):
+def test_is_tune_present_empty_dir(ytdlp_adapter, monkeypatch, tmp_path):
     """
     Given an empty directory,
     When _is_tune_already_present is called,
     Then it should return False.
     """
-    ytdlp_adapter._mutagen_adapter.get_comment = MagicMock()
+    get_comment = MagicMock()
+    monkeypatch.setattr(ytdlp_adapter._mutagen_adapter, "get_comment", get_comment)
 
-    result = ytdlp_adapter._is_tune_already_present("http://any.url", "/empty/dir")
+    result = ytdlp_adapter._is_tune_already_present("http://any.url", str(tmp_path))
 
     assert result is False
-    ytdlp_adapter._mutagen_adapter.get_comment.assert_not_called()
+    get_comment.assert_not_called()
+
+
+def test_is_tune_present_reads_only_mp3_files(ytdlp_adapter, monkeypatch, tmp_path):
+    """
+    Given a directory holding an MP3, another file and a subdirectory,
+    When _is_tune_already_present is called,
+    Then only the MP3 file's comment should be read.
+    """
+    song = tmp_path / "song.mp3"
+    song.touch()
+    (tmp_path / "cover.jpg").touch()
+    (tmp_path / "album.mp3").mkdir()
+    get_comment = MagicMock(return_value="http://matching.url")
+    monkeypatch.setattr(ytdlp_adapter._mutagen_adapter, "get_comment", get_comment)
+
+    assert ytdlp_adapter._is_tune_already_present("http://matching.url", str(tmp_path))
+    get_comment.assert_called_once_with(song)
+
+
+def test_is_tune_present_scans_destination_once(ytdlp_adapter, monkeypatch, tmp_path):
+    """
+    Given a directory that was already scanned,
+    When _is_tune_already_present is called again for another URL,
+    Then the MP3 comments should not be read a second time.
+    """
+    (tmp_path / "song.mp3").touch()
+    get_comment = MagicMock(return_value="http://matching.url")
+    monkeypatch.setattr(ytdlp_adapter._mutagen_adapter, "get_comment", get_comment)
+
+    first = ytdlp_adapter._is_tune_already_present("http://matching.url", str(tmp_path))
+    second = ytdlp_adapter._is_tune_already_present("http://other.url", str(tmp_path))
+
+    assert first is True
+    assert second is False
+    get_comment.assert_called_once()
+
+
+# --- Tests for the external downloader option ---
+
+
+@patch("adapters.ytdlp_adapter.shutil.which", return_value="/usr/bin/aria2c")
+def test_external_downloader_added_to_opts(mock_which):
+    """
+    Given aria2c is installed,
+    When use_external_downloader("aria2c") is called,
+    Then yt-dlp options should delegate downloads to it with multi-connection args.
+    """
+    adapter = YTDLPAdapter()
+
+    assert adapter.use_external_downloader("aria2c") is True
+
+    opts = adapter._get_ydl_opts("/fake/path", "192", False, is_playlist=False)
+    assert opts["external_downloader"] == {"default": "aria2c"}
+    assert opts["external_downloader_args"] == {"aria2c": ["-x", "16", "-k", "1M"]}
+
+
+@patch("adapters.ytdlp_adapter.shutil.which", return_value=None)
+def test_external_downloader_missing_falls_back(mock_which, caplog):
+    """
+    Given aria2c is not installed,
+    When use_external_downloader("aria2c") is called,
+    Then the native downloader should be kept and a warning logged.
+    """
+    adapter = YTDLPAdapter()
+
+    assert adapter.use_external_downloader("aria2c") is False
+
+    opts = adapter._get_ydl_opts("/fake/path", "192", False, is_playlist=False)
+    assert "external_downloader" not in opts
+    assert any(
+        "External downloader 'aria2c' not found" in r.getMessage()
+        for r in caplog.records
+    )
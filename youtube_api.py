@@ -1,6 +1,6 @@
 import logging
+from typing import Any, Optional, Tuple
 from pymonad.either import Left, Right
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from domain.errors import YouTubeApiError
@@ -8,6 +8,34 @@ from domain.errors import YouTubeApiError
 logger = logging.getLogger(__name__)
 
 
+def _error_content(error: HttpError) -> str:
+    """Corps de la réponse d'erreur, décodé sans échouer sur un contenu non UTF-8."""
+    return error.content.decode("utf-8", errors="replace")
+
+
+# Dernier service construit, avec ses credentials : (credentials, service).
+# Une seule entrée suffit, auth renvoie le même objet credentials à chaque appel.
+_service_cache: Optional[Tuple[Any, Any]] = None
+
+
+def _build_service(credentials):
+    """
+    Construit le service YouTube Data API v3, une seule fois par objet credentials.
+
+    googleapiclient.discovery est importé ici plutôt qu'au chargement du module :
+    il est lourd et inutile tant qu'aucun appel à l'API n'est fait.
+    """
+    global _service_cache
+    if _service_cache is not None and _service_cache[0] is credentials:
+        return _service_cache[1]
+
+    from googleapiclient.discovery import build
+
+    service = build("youtube", "v3", credentials=credentials)
+    _service_cache = (credentials, service)
+    return service
+
+
 def create_playlist(credentials, title: str, description: str, private: bool):
     """
     Crée une playlist sur YouTube en utilisant les credentials fournis.
@@ -23,7 +51,7 @@ def create_playlist(credentials, title: str, description: str, private: bool):
     """
     try:
         logger.info("Building YouTube service with credentials.")
-        youtube = build("youtube", "v3", credentials=credentials)
+        youtube = _build_service(credentials)
 
         privacy_status = "private" if private else "public"
 
@@ -44,9 +72,7 @@ def create_playlist(credentials, title: str, description: str, private: bool):
         return Right(playlist_id)
 
     except HttpError as e:
-        error_message = (
-            f"API error during playlist creation: {e.content.decode('utf-8')}"
-        )
+        error_message = f"API error during playlist creation: {_error_content(e)}"
         logger.error(f"Failed to create playlist '{title}': {error_message}")
         return Left(YouTubeApiError(error_message))
     except Exception as e:
@@ -67,7 +93,7 @@ def delete_playlist(credentials, playlist_id: str):
     """
     try:
         logger.info("Building YouTube service for deletion.")
-        youtube = build("youtube", "v3", credentials=credentials)
+        youtube = _build_service(credentials)
 
         logger.info(f"Sending deletion request for playlist '{playlist_id}'.")
         youtube.playlists().delete(id=playlist_id).execute()
@@ -77,7 +103,7 @@ def delete_playlist(credentials, playlist_id: str):
         return Right(success_message)
 
     except HttpError as e:
-        error_message = f"API error during deletion: {e.content.decode('utf-8')}"
+        error_message = f"API error during deletion: {_error_content(e)}"
         logger.error(f"Failed to delete playlist '{playlist_id}': {error_message}")
         return Left(YouTubeApiError(error_message))
     except Exception as e:
@@ -100,7 +126,7 @@ def get_playlist_url(credentials, playlist_id: str):
     """
     try:
         logger.info("Building YouTube service to retrieve URL.")
-        youtube = build("youtube", "v3", credentials=credentials)
+        youtube = _build_service(credentials)
 
         logger.info(f"Checking existence of playlist '{playlist_id}'.")
         request = youtube.playlists().list(part="id", id=playlist_id)
@@ -116,7 +142,7 @@ def get_playlist_url(credentials, playlist_id: str):
         return Right(playlist_url)
 
     except HttpError as e:
-        error_message = f"API error during URL retrieval: {e.content.decode('utf-8')}"
+        error_message = f"API error during URL retrieval: {_error_content(e)}"
         logger.error(
             f"Failed to retrieve URL for playlist '{playlist_id}': {error_message}"
         )
@@ -124,3 +150,72 @@ def get_playlist_url(credentials, playlist_id: str):
     except Exception as e:
         logger.error(f"An unexpected error occurred: {e}")
         return Left(YouTubeApiError(f"An unexpected error occurred: {e}"))
+
+
+# Nombre maximal de requêtes acceptées par l'API dans une même requête batch.
+BATCH_SIZE = 50
+
+
+def batch_operations(credentials, operations):
+    """
+    Exécute plusieurs opérations sur les playlists en regroupant les requêtes
+    par lots de BATCH_SIZE : un seul aller-retour HTTP par lot.
+
+    Args:
+        credentials: L'objet credentials obtenu via le flux OAuth.
+        operations: Liste de couples (méthode, paramètres) de youtube.playlists(),
+            par exemple ("delete", {"id": playlist_id}).
+
+    Returns:
+        list: Un Either par opération, dans l'ordre : Right(réponse de l'API)
+        ou Left(YouTubeApiError).
+    """
+    results = [None] * len(operations)
+
+    def on_response(request_id, response, exception):
+        index = int(request_id)
+        if exception is None:
+            results[index] = Right(response)
+        elif isinstance(exception, HttpError):
+            error_message = (
+                f"API error during batch operation: {_error_content(exception)}"
+            )
+            logger.error(f"Batch operation {index} failed: {error_message}")
+            results[index] = Left(YouTubeApiError(error_message))
+        else:
+            logger.error(f"Batch operation {index} failed: {exception}")
+            results[index] = Left(
+                YouTubeApiError(f"An unexpected error occurred: {exception}")
+            )
+
+    try:
+        logger.info("Building YouTube service for batch operations.")
+        youtube = _build_service(credentials)
+
+        for start in range(0, len(operations), BATCH_SIZE):
+            end = min(start + BATCH_SIZE, len(operations))
+            batch = youtube.new_batch_http_request(callback=on_response)
+            for index in range(start, end):
+                method, params = operations[index]
+                request = getattr(youtube.playlists(), method)(**params)
+                batch.add(request, request_id=str(index))
+
+            logger.info(f"Sending batch of {end - start} playlist requests.")
+            batch.execute()
+
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during batch operations: {e}")
+        error = YouTubeApiError(f"An unexpected error occurred: {e}")
+        results = [Left(error) if r is None else r for r in results]
+
+    # Une opération sans réponse dans son lot reste une erreur, jamais None.
+    unanswered = [index for index, r in enumerate(results) if r is None]
+    if unanswered:
+        logger.error(f"No response for batch operations {unanswered}.")
+        results = [
+            Left(YouTubeApiError("No response received for this operation."))
+            if r is None
+            else r
+            for r in results
+        ]
+    return results